@@ -30,6 +30,7 @@ class Config:
     EMBEDDING_MODEL: str = "paraphrase-multilingual-MiniLM-L12-v2"
     
     # Performance
+    ENCODE_BATCH_SIZE: int = 64  # minibatch size for model.encode calls
     EMBEDDING_CACHE_SIZE: int = 1000  # future use
     FAISS_ENABLED: bool = False  # future, if users > 50k
     EMBEDDING_TIMEOUT_MS: int = 200  # per-request budget
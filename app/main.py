@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from sentence_transformers import SentenceTransformer
-from app.utils import load_data
+from app.utils import load_data, load_sentence_transformer
 from app.routes.match_users import match_users
 from app.routes.similar_transactions import similar_transactions, initialize_transaction_embeddings
 from app.config.settings import config
@@ -10,6 +10,7 @@ from app.observability.logger import RequestLogger
 from pydantic import BaseModel
 import os
 import asyncio
+import threading
 from contextlib import asynccontextmanager
 
 # Global variables for preprocessed data
@@ -20,6 +21,43 @@ transactions = None
 users = None
 startup_complete = False
 
+# Lazy singleton for the user embedding model - loaded once per process and
+# shared by every consumer instead of re-instantiated per caller.
+_model_lock = threading.Lock()
+_user_embedding_model = None
+
+
+def _prefetch_user_cache(cache_path: str):
+    """
+    Warm the page cache for the preprocessed-user pickle.
+
+    Runs in a background thread concurrently with the embedding-model load,
+    so the disk read and the weight load overlap instead of running serially.
+    """
+    try:
+        if not os.path.exists(cache_path):
+            return
+        with open(cache_path, 'rb') as f:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            # Read the file so the subsequent pickle.load hits warm pages
+            while f.read(1 << 20):
+                pass
+    except OSError:
+        pass
+
+
+def get_user_embedding_model() -> SentenceTransformer:
+    """Load the user embedding model once per process (double-checked locking)."""
+    global _user_embedding_model
+    if _user_embedding_model is None:
+        with _model_lock:
+            if _user_embedding_model is None:
+                print(f"Loading embedding model: {config.EMBEDDING_MODEL}")
+                _user_embedding_model = load_sentence_transformer(config.EMBEDDING_MODEL)
+                print("Embedding model loaded successfully!")
+    return _user_embedding_model
+
 async def startup_task():
     """Background task to initialize models - doesn't block server startup."""
     global preprocessed_users, user_embedding_model, request_logger, transactions, users, startup_complete
@@ -37,10 +75,17 @@ async def startup_task():
     try:
         print("Initializing user preprocessing and embeddings...")
         
-        # Load multilingual embedding model for user matching
-        print(f"Loading embedding model: {config.EMBEDDING_MODEL}")
-        user_embedding_model = SentenceTransformer(config.EMBEDDING_MODEL)
-        print("Embedding model loaded successfully!")
+        # Prefetch the user cache from disk while the model weights load
+        prefetch_thread = threading.Thread(
+            target=_prefetch_user_cache,
+            args=(config.USER_ENRICHED_PKL,),
+            daemon=True
+        )
+        prefetch_thread.start()
+
+        # Load multilingual embedding model for user matching (process-wide singleton)
+        user_embedding_model = get_user_embedding_model()
+        prefetch_thread.join()
         
         # Initialize user preprocessor
         user_processor = UserPreprocessor(embedding_model=user_embedding_model)
@@ -77,6 +122,8 @@ async def lifespan(app: FastAPI):
     # Cleanup if needed
     if not task.done():
         task.cancel()
+    if request_logger is not None:
+        request_logger.close()
 
 # Initialize FastAPI app with lifespan
 app = FastAPI(
@@ -1,12 +1,118 @@
 """Candidate name extraction from transaction descriptions."""
 import re
+import numpy as np
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
 from app.config.settings import config
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
-@dataclass
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Precompiled per-anchor patterns. These must run as independent scans:
+# the anchors overlap by construction ("from emma brown for deel" yields
+# both a 'from' and a 'for deel' candidate from the same span), so folding
+# them into one alternation would let finditer's non-overlapping matching
+# suppress lower-priority candidates.
+_FROM_RE = re.compile(r'\bfrom\s+([^,]+?)(?:\s+for\b|,|$)', re.IGNORECASE)
+_REF_RE = re.compile(
+    r'\bref\s*:\s*([^,]+?)(?:\s+(?:cntr|for|and|cc)\b|,|$)', re.IGNORECASE
+)
+_FOR_DEEL_RE = re.compile(r'(.+?)\s+for\s+deel\b', re.IGNORECASE)
+_HAS_ALPHA_RE = re.compile(r'[a-z]', re.IGNORECASE)
+_CC_RE = re.compile(r'\bcc\b')
+
+# Whitespace plus surrounding punctuation, stripped from candidate text at
+# extraction time (replaces the old post-filter pass)
+_STRIP_CHARS = ' \t.,;:!?()-[]{}"\''
+
+# Anchor ids for the Hyperscan database (must line up with _ANCHOR_EXTRACTORS)
+_HS_FROM_ID = 0
+_HS_REF_ID = 1
+_HS_FORDEEL_ID = 2
+
+# Hyperscan can't report capture groups, so the database only answers "which
+# anchors are present" in one C-level sweep; the precompiled Python patterns
+# then extract the actual names, but only for anchors that hit.
+_HS_ANCHOR_PATTERNS = [
+    (rb'\bfrom\s', _HS_FROM_ID),
+    (rb'\bref\s*:', _HS_REF_ID),
+    (rb'\sfor\s+deel\b', _HS_FORDEEL_ID),
+]
+
+
+def _build_hs_database():
+    """Compile the anchor patterns into a single Hyperscan block database."""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[pattern for pattern, _ in _HS_ANCHOR_PATTERNS],
+            ids=[pattern_id for _, pattern_id in _HS_ANCHOR_PATTERNS],
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(_HS_ANCHOR_PATTERNS)
+        )
+        return db
+    except Exception:
+        return None
+
+
+_hs_db = _build_hs_database()
+
+
+def _fallback_window_survivors(has_alpha, is_boilerplate):
+    """
+    Return (start, window_size) pairs for 2/3/4-token windows that contain
+    at least 2 alphabetic tokens and are not all boilerplate.
+
+    Pure-numpy implementation; replaced by a Numba-compiled version below
+    when numba is installed.
+    """
+    n = has_alpha.shape[0]
+    survivors = []
+    cum_alpha = np.concatenate(([0], has_alpha.cumsum()))
+    cum_boiler = np.concatenate(([0], is_boilerplate.cumsum()))
+    for window_size in (2, 3, 4):
+        if n < window_size:
+            break
+        alpha_counts = cum_alpha[window_size:] - cum_alpha[:-window_size]
+        boiler_counts = cum_boiler[window_size:] - cum_boiler[:-window_size]
+        for i in np.flatnonzero((alpha_counts >= 2) & (boiler_counts < window_size)):
+            survivors.append((int(i), window_size))
+    return survivors
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _fallback_window_survivors_jit(has_alpha, is_boilerplate):  # pragma: no cover
+        n = has_alpha.shape[0]
+        survivors = []
+        for window_size in (2, 3, 4):
+            if n < window_size:
+                break
+            alpha_count = 0
+            boiler_count = 0
+            for j in range(window_size):
+                alpha_count += has_alpha[j]
+                boiler_count += is_boilerplate[j]
+            for i in range(n - window_size + 1):
+                if i > 0:
+                    alpha_count += has_alpha[i + window_size - 1] - has_alpha[i - 1]
+                    boiler_count += is_boilerplate[i + window_size - 1] - is_boilerplate[i - 1]
+                if alpha_count >= 2 and boiler_count < window_size:
+                    survivors.append((i, window_size))
+        return survivors
+
+
+@dataclass(slots=True)
 class Candidate:
     """Candidate name with metadata."""
     text: str
@@ -14,6 +120,11 @@ class Candidate:
     start_pos: int
     end_pos: int
     priority: int  # Higher = better (from=3, ref=2, for_deel=1, fallback=0)
+    text_lower: str = ''  # lowercase copy of text, kept in sync
+
+    def __post_init__(self):
+        if not self.text_lower:
+            self.text_lower = self.text.lower()
 
 
 class CandidateExtractor:
@@ -44,118 +155,170 @@ class CandidateExtractor:
             max_candidates = config.MAX_CANDIDATES
         
         candidates = []
-        
-        # Extract from different anchor patterns
-        candidates.extend(self._extract_after_from(soft_cleaned_text))
-        candidates.extend(self._extract_after_ref(soft_cleaned_text))
-        candidates.extend(self._extract_before_for_deel(soft_cleaned_text))
+
+        # Extract from the anchor patterns. When Hyperscan is available,
+        # a single pre-scan tells us which anchors are present so absent
+        # ones skip their regex walk entirely.
+        present_anchors = self._scan_anchors(soft_cleaned_text)
+        candidates.extend(
+            self._extract_anchor_candidates(soft_cleaned_text, present_anchors)
+        )
         
         # If no candidates found, use fallback windows
         if not candidates:
             candidates.extend(self._fallback_windows(soft_cleaned_text))
         
-        # Post-filter and prioritize
-        candidates = self._post_filter_candidates(candidates, soft_cleaned_text)
-        
-        # Sort by priority and take top candidates
-        candidates.sort(key=lambda c: (c.priority, -len(c.text)), reverse=True)
-        
-        # Remove duplicates (same text)
-        seen_texts = set()
-        unique_candidates = []
+        # Deduplicate in one scan: keep the highest-priority candidate per
+        # normalized text, then sort just the survivors
+        best: Dict[str, Candidate] = {}
         for candidate in candidates:
-            text_normalized = candidate.text.lower().strip()
-            if text_normalized not in seen_texts and text_normalized:
-                seen_texts.add(text_normalized)
-                unique_candidates.append(candidate)
-                if len(unique_candidates) >= max_candidates:
-                    break
-        
-        return unique_candidates
-    
-    def _extract_after_from(self, text: str) -> List[Candidate]:
-        """Extract name after 'from' anchor."""
-        candidates = []
-        # Pattern: "from <name>" until "for", comma, or end
-        pattern = r'\bfrom\s+([^,]+?)(?:\s+for\b|,|$)'
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            name_text = match.group(1).strip()
-            if self._is_valid_candidate(name_text):
-                candidates.append(Candidate(
-                    text=name_text,
-                    anchor='from',
-                    start_pos=match.start(1),
-                    end_pos=match.end(1),
-                    priority=3
-                ))
-        return candidates
-    
-    def _extract_after_ref(self, text: str) -> List[Candidate]:
-        """Extract name after 'ref:' anchor."""
-        candidates = []
-        # Pattern: "ref: <name>" until comma/end/cntr/for/and/cc
-        pattern = r'\bref\s*:\s*([^,]+?)(?:\s+(?:cntr|for|and|cc)\b|,|$)'
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            name_text = match.group(1).strip()
-            if self._is_valid_candidate(name_text):
-                candidates.append(Candidate(
-                    text=name_text,
-                    anchor='ref',
-                    start_pos=match.start(1),
-                    end_pos=match.end(1),
-                    priority=2
-                ))
-        return candidates
+            text_normalized = candidate.text_lower.strip()
+            if not text_normalized:
+                continue
+            current = best.get(text_normalized)
+            if current is None or candidate.priority > current.priority:
+                best[text_normalized] = candidate
+
+        # Sort by priority (highest first), shorter text breaking ties
+        unique_candidates = sorted(
+            best.values(),
+            key=lambda c: (-c.priority, len(c.text))
+        )
+        return unique_candidates[:max_candidates]
     
-    def _extract_before_for_deel(self, text: str) -> List[Candidate]:
-        """Extract name before 'for deel' anchor."""
+    def _scan_anchors(self, text: str) -> Optional[set]:
+        """
+        Scan text once with Hyperscan and return the set of anchor ids present.
+
+        Args:
+            text: Soft-cleaned description text
+
+        Returns:
+            Set of matched anchor ids, or None if Hyperscan is unavailable
+            (callers then fall back to running every extractor)
+        """
+        if _hs_db is None:
+            return None
+
+        matched_ids = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            matched_ids.add(pattern_id)
+
+        try:
+            _hs_db.scan(text.encode('utf-8'), match_event_handler=on_match)
+        except Exception:
+            return None
+
+        return matched_ids
+
+    def _extract_anchor_candidates(
+        self,
+        text: str,
+        present_anchors: Optional[set] = None
+    ) -> List[Candidate]:
+        """
+        Extract candidates for every anchor present in the text.
+
+        Each anchor runs as its own scan - they overlap on purpose, so one
+        description can yield a 'from' (priority 3), a 'ref:' (priority 2)
+        and a 'for deel' (priority 1) candidate from the same span. When
+        the Hyperscan pre-scan reported which anchors are present, absent
+        anchors skip their pass.
+
+        Args:
+            text: Soft-cleaned description text
+            present_anchors: Anchor ids found by the pre-scan, or None when
+                Hyperscan is unavailable (every pass then runs)
+
+        Returns:
+            List of Candidate objects
+        """
         candidates = []
-        # Pattern: "<name> for deel"
-        pattern = r'(.+?)\s+for\s+deel\b'
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            # Get the text before "for deel"
-            before_text = match.group(1).strip()
-            # Try to extract just the name part (last 2-4 words before "for deel")
-            words = before_text.split()
-            if len(words) >= 2:
-                # Take last 2-4 words as potential name
-                name_words = words[-4:] if len(words) >= 4 else words
-                name_text = ' '.join(name_words)
+
+        if present_anchors is None or _HS_FROM_ID in present_anchors:
+            for match in _FROM_RE.finditer(text):
+                name_text = match.group(1).strip(_STRIP_CHARS)
+                if self._is_valid_candidate(name_text):
+                    candidates.append(Candidate(
+                        text=name_text,
+                        anchor='from',
+                        start_pos=match.start(1),
+                        end_pos=match.end(1),
+                        priority=3
+                    ))
+
+        if present_anchors is None or _HS_REF_ID in present_anchors:
+            for match in _REF_RE.finditer(text):
+                name_text = match.group(1).strip(_STRIP_CHARS)
                 if self._is_valid_candidate(name_text):
                     candidates.append(Candidate(
                         text=name_text,
-                        anchor='for_deel',
+                        anchor='ref',
                         start_pos=match.start(1),
                         end_pos=match.end(1),
-                        priority=1
+                        priority=2
                     ))
+
+        if present_anchors is None or _HS_FORDEEL_ID in present_anchors:
+            for match in _FOR_DEEL_RE.finditer(text):
+                # Get the text before "for deel"
+                before_text = match.group(1).strip(_STRIP_CHARS)
+                # Try to extract just the name part (last 2-4 words before "for deel")
+                words = before_text.split()
+                if len(words) >= 2:
+                    # Take last 2-4 words as potential name
+                    name_words = words[-4:] if len(words) >= 4 else words
+                    name_text = ' '.join(name_words)
+                    if self._is_valid_candidate(name_text):
+                        candidates.append(Candidate(
+                            text=name_text,
+                            anchor='for_deel',
+                            start_pos=match.start(1),
+                            end_pos=match.end(1),
+                            priority=1
+                        ))
+
         return candidates
     
     def _fallback_windows(self, text: str) -> List[Candidate]:
         """Fallback: sliding windows of 2-4 tokens with ≥2 alphabetic tokens."""
-        candidates = []
+        candidates: List[Candidate] = []
         words = text.split()
         
         if len(words) < 2:
             return candidates
-        
-        # Try windows of size 2, 3, and 4
-        for window_size in [2, 3, 4]:
-            for i in range(len(words) - window_size + 1):
-                window = words[i:i + window_size]
-                window_text = ' '.join(window)
-                
-                # Check if has at least 2 alphabetic tokens
-                alpha_count = sum(1 for w in window if re.search(r'[a-z]', w, re.IGNORECASE))
-                if alpha_count >= 2 and self._is_valid_candidate(window_text):
-                    candidates.append(Candidate(
-                        text=window_text,
-                        anchor='fallback',
-                        start_pos=i,
-                        end_pos=i + window_size,
-                        priority=0
-                    ))
-        
+
+        # Check each word's alphabetic-ness and boilerplate-ness once; the
+        # window kernel (Numba-compiled when available) then finds surviving
+        # windows without re-scanning words.
+        has_alpha = np.fromiter(
+            (bool(_HAS_ALPHA_RE.search(w)) for w in words),
+            dtype=np.int8,
+            count=len(words)
+        )
+        is_boilerplate = np.fromiter(
+            (w.lower() in self.BOILERPLATE_WORDS for w in words),
+            dtype=np.int8,
+            count=len(words)
+        )
+
+        if njit is not None:
+            survivors = _fallback_window_survivors_jit(has_alpha, is_boilerplate)
+        else:
+            survivors = _fallback_window_survivors(has_alpha, is_boilerplate)
+
+        for start, window_size in survivors:
+            window_text = ' '.join(words[start:start + window_size])
+            if self._is_valid_candidate(window_text):
+                candidates.append(Candidate(
+                    text=window_text,
+                    anchor='fallback',
+                    start_pos=int(start),
+                    end_pos=int(start) + window_size,
+                    priority=0
+                ))
+
         return candidates
     
     def _is_valid_candidate(self, text: str) -> bool:
@@ -173,32 +336,8 @@ class CandidateExtractor:
             return False
         
         # Should contain at least some alphabetic characters
-        if not re.search(r'[a-z]', text, re.IGNORECASE):
+        if not _HAS_ALPHA_RE.search(text):
             return False
         
         return True
-    
-    def _post_filter_candidates(
-        self, 
-        candidates: List[Candidate], 
-        text: str
-    ) -> List[Candidate]:
-        """Post-filter candidates: trim punctuation, prefer 2-4 tokens."""
-        filtered = []
-        for candidate in candidates:
-            # Trim surrounding punctuation
-            cleaned = candidate.text.strip('.,;:!?()-[]{}"\'').strip()
-            if not cleaned:
-                continue
-            
-            # Prefer 2-4 words
-            words = cleaned.split()
-            if len(words) < 1 or len(words) > 6:
-                continue
-            
-            # Update candidate text
-            candidate.text = cleaned
-            filtered.append(candidate)
-        
-        return filtered
 
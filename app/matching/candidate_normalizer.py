@@ -1,5 +1,6 @@
 """Candidate normalization and variant generation."""
 import re
+from functools import lru_cache
 from typing import List, Set, Optional
 from unidecode import unidecode
 
@@ -8,6 +9,26 @@ from app.matching.transliteration_map import get_transliteration, has_non_latin_
 from app.matching.misspelling_map import normalize_misspelling
 
 
+# Precompiled patterns for variant generation
+_WHITESPACE_RE = re.compile(r'\s+')
+_TRAILING_DIGITS_RE = re.compile(r'\d+$')
+
+# Fast path for the Latin-1 diacritics that dominate traffic: str.translate
+# runs in C, so unidecode (pure Python, per-character) only handles the
+# codepoints this table doesn't cover.
+_FAST_TRANSLATE = str.maketrans({
+    'à': 'a', 'á': 'a', 'â': 'a', 'ã': 'a', 'ä': 'a', 'å': 'a',
+    'ç': 'c',
+    'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
+    'ì': 'i', 'í': 'i', 'î': 'i', 'ï': 'i',
+    'ñ': 'n',
+    'ò': 'o', 'ó': 'o', 'ô': 'o', 'õ': 'o', 'ö': 'o', 'ø': 'o',
+    'ù': 'u', 'ú': 'u', 'û': 'u', 'ü': 'u',
+    'ý': 'y', 'ÿ': 'y',
+    'ß': 'ss', 'æ': 'ae', 'œ': 'oe',
+})
+
+
 class CandidateNormalizer:
     """Normalize candidates and generate variants."""
     
@@ -18,9 +39,17 @@ class CandidateNormalizer:
         Args:
             all_user_tokens: List of all user tokens for glued word detection
         """
-        self.all_user_tokens = set(all_user_tokens or [])
+        # Frozen lowercase set: tokens arrive lowercased from preprocessing,
+        # and candidates are lowercased before lookup, so one probe per part
+        # suffices in _try_split_token.
+        self.all_user_tokens = frozenset(t.lower() for t in (all_user_tokens or []))
         # Create a set of common first/last name tokens for better splitting
         self._build_token_combinations()
+        # Memoize variant generation per instance: repeated descriptions and
+        # recurring sender names hit the cache instead of re-deriving variants
+        self._generate_variants_cached = lru_cache(
+            maxsize=config.EMBEDDING_CACHE_SIZE
+        )(self._generate_variants_uncached)
     
     def _build_token_combinations(self):
         """Build common token combinations for glued word detection."""
@@ -47,12 +76,15 @@ class CandidateNormalizer:
         
         # Lowercase
         text = candidate.lower().strip()
-        
-        # Strip diacritics
-        text = unidecode(text)
+
+        # Strip diacritics: translate common Latin-1 ones in C, then fall
+        # back to unidecode only if non-ASCII characters remain
+        text = text.translate(_FAST_TRANSLATE)
+        if not text.isascii():
+            text = unidecode(text)
         
         # Collapse internal spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         text = text.strip()
         
         return text
@@ -82,14 +114,44 @@ class CandidateNormalizer:
         """
         if max_variants is None:
             max_variants = config.MAX_VARIANTS_PER_CANDIDATE
-        
-        variants = set()
-        
-        # Normalize first
+
         normalized = self.normalize_candidate(candidate)
+        return list(self._generate_variants_cached(normalized, max_variants))
+
+    def generate_variants_normalized(
+        self,
+        normalized: str,
+        max_variants: Optional[int] = None
+    ) -> List[str]:
+        """
+        Generate variants for text that is already normalized.
+
+        Skips the normalize_candidate pass for callers (the match pipeline)
+        that have normalized the candidate themselves.
+
+        Args:
+            normalized: Already-normalized candidate text
+            max_variants: Maximum number of variants to generate
+
+        Returns:
+            List of variant strings
+        """
+        if max_variants is None:
+            max_variants = config.MAX_VARIANTS_PER_CANDIDATE
+
+        return list(self._generate_variants_cached(normalized, max_variants))
+
+    def _generate_variants_uncached(
+        self,
+        normalized: str,
+        max_variants: int
+    ) -> tuple:
+        """Compute variants for normalized text (memoized via lru_cache)."""
+        variants = set()
+
         if not normalized:
-            return []
-        
+            return ()
+
         # Apply misspelling correction
         corrected = normalize_misspelling(normalized)
         normalized = corrected
@@ -104,7 +166,7 @@ class CandidateNormalizer:
         tokens = normalized.split()
         
         if not tokens:
-            return list(variants)
+            return tuple(variants)
         
         # Reversed order (if exactly 2 tokens)
         if len(tokens) == 2:
@@ -121,17 +183,18 @@ class CandidateNormalizer:
                 variants.add(' '.join(filtered_tokens))
         
         # Drop numeric tails
-        for token in tokens:
+        for i, token in enumerate(tokens):
             # Remove trailing digits
-            cleaned_token = re.sub(r'\d+$', '', token)
+            cleaned_token = _TRAILING_DIGITS_RE.sub('', token)
             if cleaned_token and cleaned_token != token:
-                # Rebuild with cleaned token
-                new_tokens = [t if t != token else cleaned_token for t in tokens]
+                # Rebuild with cleaned token swapped in at its position
+                new_tokens = tokens.copy()
+                new_tokens[i] = cleaned_token
                 variants.add(' '.join(new_tokens))
         
         # Transliteration if non-Latin
-        if has_non_latin_chars(candidate):
-            transliterated = get_transliteration(candidate)
+        if has_non_latin_chars(normalized):
+            transliterated = get_transliteration(normalized)
             if transliterated:
                 variants.add(transliterated.lower())
                 # Also try reversed if 2 tokens
@@ -140,8 +203,7 @@ class CandidateNormalizer:
                     variants.add(f"{translit_tokens[1]} {translit_tokens[0]}")
         
         # Limit variants
-        variants_list = list(variants)[:max_variants]
-        return variants_list
+        return tuple(variants)[:max_variants]
     
     def _split_glued_words(self, text: str) -> str:
         """
@@ -184,22 +246,16 @@ class CandidateNormalizer:
         """
         if not self.all_user_tokens:
             return None
-        
+
         # Try splitting at various positions
-        for split_pos in range(3, len(token) - 2):
+        token_len = len(token)
+        for split_pos in range(3, token_len - 2):
             part1 = token[:split_pos]
             part2 = token[split_pos:]
-            
+
             # Check if both parts are in user tokens
             if part1 in self.all_user_tokens and part2 in self.all_user_tokens:
                 return [part1, part2]
-            
-            # Also try with first letter capitalized (common pattern)
-            part1_cap = part1.capitalize()
-            part2_cap = part2.capitalize()
-            if (part1_cap in self.all_user_tokens or part1 in self.all_user_tokens) and \
-               (part2_cap in self.all_user_tokens or part2 in self.all_user_tokens):
-                return [part1, part2]
-        
+
         return None
 
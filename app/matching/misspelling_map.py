@@ -1,6 +1,14 @@
 """Misspelling normalization map for common mistakes."""
+import re
 from typing import Optional, Dict
 
+# pyahocorasick matches every key in one O(n) automaton pass regardless of
+# map size; optional, with the combined-alternation regex as fallback
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 # Misspelling map for observed mistakes in the dataset
 MISSPELLING_MAP: Dict[str, str] = {
@@ -12,28 +20,56 @@ MISSPELLING_MAP: Dict[str, str] = {
     "matthewbrooks": "matthew brooks",  # Glued compound name
 }
 
+# One alternation over every misspelling: a single C-level scan replaces the
+# per-key Python substring loop. Longer keys first so glued compounds win
+# over their substrings.
+_MISSPELLING_RE = re.compile(
+    '|'.join(re.escape(k) for k in sorted(MISSPELLING_MAP, key=len, reverse=True))
+)
+
+# Aho-Corasick automaton over the same keys, built once at import time;
+# stays O(n) in text length however large the map grows
+if ahocorasick is not None:
+    _MISSPELLING_AC = ahocorasick.Automaton()
+    for _key, _value in MISSPELLING_MAP.items():
+        _MISSPELLING_AC.add_word(_key, (_key, _value))
+    _MISSPELLING_AC.make_automaton()
+else:
+    _MISSPELLING_AC = None
+
+
+def _find_misspelling(text_lower: str) -> Optional[str]:
+    """Find the first misspelling key present in text, preferring longer keys."""
+    if _MISSPELLING_AC is not None:
+        best = None
+        for _end, (key, _correction) in _MISSPELLING_AC.iter(text_lower):
+            if best is None or len(key) > len(best):
+                best = key
+        return best
+    match = _MISSPELLING_RE.search(text_lower)
+    return match.group(0) if match else None
+
 
 def normalize_misspelling(text: str) -> str:
     """
     Normalize common misspellings in text.
-    
+
     Args:
         text: Text that may contain misspellings
-        
+
     Returns:
         Corrected text or original if no correction found
     """
     text_lower = text.lower().strip()
-    
+
     # Try exact match first
     if text_lower in MISSPELLING_MAP:
         return MISSPELLING_MAP[text_lower]
-    
-    # Try partial matches (for glued words)
-    for misspelling, correction in MISSPELLING_MAP.items():
-        if misspelling in text_lower:
-            # Replace the misspelling with correction
-            return text_lower.replace(misspelling, correction)
-    
+
+    # Try partial matches (for glued words) in one scan
+    misspelling = _find_misspelling(text_lower)
+    if misspelling:
+        return text_lower.replace(misspelling, MISSPELLING_MAP[misspelling])
+
     return text
 
@@ -1,7 +1,13 @@
 """Transliteration map for known non-Latin names."""
+import re
 from typing import Optional, Dict
 
 
+# Any codepoint above ASCII counts as non-Latin; one C-level scan replaces
+# the per-character Python loop
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+
+
 # Transliteration map for known non-Latin names in the dataset
 TRANSLITERATION_MAP: Dict[str, str] = {
     # Chinese names
@@ -18,6 +24,12 @@ TRANSLITERATION_MAP: Dict[str, str] = {
     "אֲבִיגַיִל גרין": "avigail green",
 }
 
+# Lowercased keys for the case-insensitive fallback: O(1) lookup instead of
+# a linear scan over the map per call
+_TRANSLITERATION_MAP_LOWER: Dict[str, str] = {
+    key.lower().strip(): value for key, value in TRANSLITERATION_MAP.items()
+}
+
 
 def get_transliteration(name: str) -> Optional[str]:
     """
@@ -34,12 +46,7 @@ def get_transliteration(name: str) -> Optional[str]:
         return TRANSLITERATION_MAP[name]
     
     # Try case-insensitive match
-    name_lower = name.lower().strip()
-    for key, value in TRANSLITERATION_MAP.items():
-        if key.lower().strip() == name_lower:
-            return value
-    
-    return None
+    return _TRANSLITERATION_MAP_LOWER.get(name.lower().strip())
 
 
 def has_non_latin_chars(text: str) -> bool:
@@ -52,9 +59,7 @@ def has_non_latin_chars(text: str) -> bool:
     Returns:
         True if contains non-Latin characters
     """
-    for char in text:
-        # Check if character is outside ASCII range and not a common punctuation
-        if ord(char) > 127 and char not in '.,;:!?-()[]{}':
-            return True
-    return False
+    # The old per-char loop exempted ASCII punctuation, but those characters
+    # are below 128 anyway, so a plain non-ASCII probe is equivalent
+    return bool(_NON_ASCII_RE.search(text))
 
@@ -8,10 +8,38 @@ from datetime import datetime
 
 from app.config.settings import config
 
+# orjson (Rust, SIMD) encodes log entries several times faster than the
+# stdlib encoder; fall back to json when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# blake3 is a SIMD hash that far outruns md5 for the privacy fingerprint;
+# optional for the same reason
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+def _encode_log_entry(log_entry: Dict[str, Any]) -> bytes:
+    """Serialize a log entry to JSON bytes with the fastest encoder available."""
+    if orjson is not None:
+        return orjson.dumps(log_entry)
+    return json.dumps(log_entry).encode()
+
 
 class RequestLogger:
     """Structured logging for matching requests."""
-    
+
+    # Batched-flush cadence: entries never sit in the userspace buffer for
+    # more than FLUSH_EVERY_N writes or FLUSH_INTERVAL_S seconds, so a
+    # crash loses at most one small batch and tail -f stays usable on
+    # low-traffic services
+    FLUSH_EVERY_N = 20
+    FLUSH_INTERVAL_S = 2.0
+
     def __init__(self, log_dir: str = "logs", debug_mode: bool = False):
         """
         Initialize RequestLogger.
@@ -23,7 +51,15 @@ class RequestLogger:
         self.log_dir = log_dir
         self.debug_mode = debug_mode
         os.makedirs(log_dir, exist_ok=True)
-        
+
+        # Persistent buffered log handle, rotated by date at write time.
+        # Opening once and buffering keeps the open/close syscalls and most
+        # write syscalls out of the request's critical path.
+        self._log_fp = None
+        self._log_date = None
+        self._writes_since_flush = 0
+        self._last_flush = time.time()
+
         # Metrics counters
         self.metrics = {
             'fuzzy_matches': 0,
@@ -78,11 +114,16 @@ class RequestLogger:
             'hard_cleaned': hard_cleaned
         }
         
-        # Write to JSONL file
-        log_file = os.path.join(self.log_dir, f"matching_{datetime.utcnow().strftime('%Y%m%d')}.jsonl")
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
-        
+        # Write to JSONL file through the persistent buffered handle,
+        # flushing in batches so entries reach disk promptly
+        self._get_log_fp().write(_encode_log_entry(log_entry) + b'\n')
+        self._writes_since_flush += 1
+        if (
+            self._writes_since_flush >= self.FLUSH_EVERY_N
+            or time.time() - self._last_flush >= self.FLUSH_INTERVAL_S
+        ):
+            self.flush()
+
         # Update metrics
         if method == 'fuzzy':
             self.metrics['fuzzy_matches'] += 1
@@ -92,6 +133,36 @@ class RequestLogger:
         if not scores:
             self.metrics['no_matches'] += 1
     
+    def _get_log_fp(self):
+        """
+        Get the buffered log file handle, rotating when the date changes.
+
+        Returns:
+            Open binary file object for today's JSONL log
+        """
+        today = datetime.utcnow().strftime('%Y%m%d')
+        if self._log_fp is None or self._log_date != today:
+            if self._log_fp is not None:
+                self._log_fp.close()
+            log_file = os.path.join(self.log_dir, f"matching_{today}.jsonl")
+            self._log_fp = open(log_file, 'ab', buffering=1 << 16)
+            self._log_date = today
+        return self._log_fp
+
+    def flush(self):
+        """Flush buffered log entries to disk and reset the batch cadence."""
+        if self._log_fp is not None:
+            self._log_fp.flush()
+        self._writes_since_flush = 0
+        self._last_flush = time.time()
+
+    def close(self):
+        """Flush and close the log file handle."""
+        if self._log_fp is not None:
+            self._log_fp.close()
+            self._log_fp = None
+            self._log_date = None
+
     def get_debug_info(
         self,
         transaction_id: str,
@@ -152,8 +223,11 @@ class RequestLogger:
         """
         if len(text) <= max_length:
             return text
-        hash_obj = hashlib.md5(text.encode())
-        return f"{text[:max_length]}...{hash_obj.hexdigest()[:8]}"
+        if blake3 is not None:
+            digest = blake3.blake3(text.encode()).hexdigest(length=4)
+        else:
+            digest = hashlib.md5(text.encode()).hexdigest()[:8]
+        return f"{text[:max_length]}...{digest}"
     
     def get_metrics(self) -> Dict[str, int]:
         """
@@ -15,7 +15,38 @@ class TextCleaner:
     
     # ACC//<digits|space|dot> blocks
     ACC_PATTERN = re.compile(r'ACC//[\d\s\.]+', re.IGNORECASE)
-    
+
+    # Digit lookalikes, fused into two passes: leading/standalone 0/1, then
+    # trailing 0/1 (separate so "0k0" resolves both ends like the old
+    # sequential substitutions did)
+    _LOOKALIKE_LEAD_RE = re.compile(r'\b[01](?=[a-z])|\b[01]\b')
+    _LOOKALIKE_TAIL_RE = re.compile(r'(?<=[a-z])[01]\b')
+
+    # ref: tokens (text is already lowercased when this runs)
+    _REF_TOKEN_RE = re.compile(r'\bref\s*:')
+
+    # Symbols to spaces, keeping colons
+    _SYMBOLS_RE = re.compile(r'[^\w\s:]')
+
+    # ASCII translation table doing the symbol pass (and lowercasing, for
+    # free) in one C loop: keeps [a-zA-Z0-9_ \t\n\r\f\v:], maps A-Z to
+    # lowercase, everything else to space. Only valid for ASCII text; the
+    # regex above stays as the fallback for non-ASCII input.
+    _SYMBOLS_TRANS = {
+        cp: (cp + 32 if 65 <= cp <= 90
+             else cp if chr(cp).isalnum() or chr(cp).isspace() or chr(cp) in '_:'
+             else ord(' '))
+        for cp in range(128)
+    }
+
+    # Whitespace collapse
+    _WS_RE = re.compile(r'\s+')
+
+    @staticmethod
+    def _fix_lookalike(match: 're.Match') -> str:
+        """Map a matched digit lookalike to its letter (0→o, 1→l)."""
+        return 'o' if match.group(0) == '0' else 'l'
+
     @staticmethod
     def soft_clean(text: str, max_length: Optional[int] = None) -> str:
         """
@@ -44,31 +75,33 @@ class TextCleaner:
         # Lowercase
         text = text.lower()
         
-        # Replace digit-lookalikes inside words (0→o, 1→l)
-        # Only replace if they're inside word boundaries
-        text = re.sub(r'\b0([a-z])', r'o\1', text)
-        text = re.sub(r'([a-z])0\b', r'\1o', text)
-        text = re.sub(r'\b1([a-z])', r'l\1', text)
-        text = re.sub(r'([a-z])1\b', r'\1l', text)
-        text = re.sub(r'\b0\b', 'o', text)  # Standalone 0
-        text = re.sub(r'\b1\b', 'l', text)  # Standalone 1
-        
+        # Replace digit-lookalikes inside words (0→o, 1→l): two fused
+        # passes instead of six separate substitutions
+        text = TextCleaner._LOOKALIKE_LEAD_RE.sub(TextCleaner._fix_lookalike, text)
+        text = TextCleaner._LOOKALIKE_TAIL_RE.sub(TextCleaner._fix_lookalike, text)
+
         # Remove ACC//<digits|space|dot> blocks
         text = TextCleaner.ACC_PATTERN.sub('', text)
-        
+
         # Keep ref: tokens intact - protect them temporarily
-        ref_placeholder = " __REF_PLACEHOLDER__ "
-        text = re.sub(r'\bref\s*:', ref_placeholder, text, flags=re.IGNORECASE)
-        
+        # (lowercase so the case-folding translate table leaves it intact)
+        ref_placeholder = " __ref_placeholder__ "
+        text = TextCleaner._REF_TOKEN_RE.sub(ref_placeholder, text)
+
         # Remove symbols to spaces, but keep colons
-        # Replace punctuation except colons and alphanumerics with spaces
-        text = re.sub(r'[^\w\s:]', ' ', text)
-        
+        # Replace punctuation except colons and alphanumerics with spaces;
+        # ASCII text takes the single-pass translate table, non-ASCII falls
+        # back to the Unicode-aware regex
+        if text.isascii():
+            text = text.translate(TextCleaner._SYMBOLS_TRANS)
+        else:
+            text = TextCleaner._SYMBOLS_RE.sub(' ', text)
+
         # Restore ref: tokens
-        text = text.replace('__REF_PLACEHOLDER__', 'ref:')
-        
+        text = text.replace('__ref_placeholder__', 'ref:')
+
         # Collapse spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = TextCleaner._WS_RE.sub(' ', text)
         text = text.strip()
         
         # Truncate if needed
@@ -93,16 +126,35 @@ class TextCleaner:
         """
         if not text:
             return ""
-        
+
         # Start with soft clean
         text = TextCleaner.soft_clean(text, max_length)
-        
+
+        return TextCleaner.hard_clean_from_soft(text)
+
+    @staticmethod
+    def hard_clean_from_soft(soft_cleaned: str) -> str:
+        """
+        Hard clean text that has already been soft cleaned.
+
+        Lets callers that already hold the soft-cleaned form skip the
+        second full pass over the raw description.
+
+        Args:
+            soft_cleaned: Output of soft_clean
+
+        Returns:
+            Hard-cleaned text
+        """
+        if not soft_cleaned:
+            return ""
+
         # Remove boilerplate tokens
-        text = TextCleaner.BOILERPLATE_PATTERN.sub(' ', text)
-        
+        text = TextCleaner.BOILERPLATE_PATTERN.sub(' ', soft_cleaned)
+
         # Collapse spaces again
-        text = re.sub(r'\s+', ' ', text)
+        text = TextCleaner._WS_RE.sub(' ', text)
         text = text.strip()
-        
+
         return text
 
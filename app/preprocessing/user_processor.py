@@ -1,13 +1,19 @@
 """User preprocessing for normalization and embedding generation."""
 import os
 import pickle
+import pickletools
 import pandas as pd
 import numpy as np
+import torch
+from itertools import chain
 from typing import List, Dict, Any, Optional
 from unidecode import unidecode
 from sentence_transformers import SentenceTransformer
 
 from app.config.settings import config
+from app.utils import configure_torch_threads, load_sentence_transformer
+
+configure_torch_threads()
 
 
 class UserPreprocessor:
@@ -22,10 +28,15 @@ class UserPreprocessor:
         """
         self.embedding_model = embedding_model
         self.model_dim = None
-        # If model is provided, get its dimension
+        # SoA views over the last preprocessed batch: one contiguous
+        # (N, D) float32 matrix plus a parallel id array, so downstream
+        # cosine scans are a single BLAS call with no gather step
+        self.embedding_matrix = None
+        self.user_ids = None
+        # If model is provided, get its dimension (a model property -
+        # no forward pass needed)
         if self.embedding_model is not None:
-            test_embedding = self.embedding_model.encode(["test"])
-            self.model_dim = test_embedding.shape[1]
+            self.model_dim = self.embedding_model.get_sentence_embedding_dimension()
     
     @staticmethod
     def strip_accents(text: str) -> str:
@@ -57,6 +68,29 @@ class UserPreprocessor:
             return ""
         return "".join(token[0].upper() if token else "" for token in tokens)
     
+    @staticmethod
+    def quantize_embedding(embedding: np.ndarray) -> tuple:
+        """
+        Quantize an embedding to int8 with a per-row scale factor.
+
+        The vector is L2-normalized first so that the int8 dot product of two
+        quantized vectors, multiplied by both scales, approximates their
+        cosine similarity.
+
+        Args:
+            embedding: Float embedding vector
+
+        Returns:
+            Tuple of (int8 array, float32 scale)
+        """
+        norm = np.linalg.norm(embedding)
+        if norm == 0:
+            return np.zeros(embedding.shape[0], dtype=np.int8), np.float32(0.0)
+        normalized = embedding / norm
+        scale = np.float32(np.max(np.abs(normalized)) / 127.0)
+        quantized = np.round(normalized / scale).astype(np.int8)
+        return quantized, scale
+
     @staticmethod
     def generate_reversed_name(tokens: List[str]) -> Optional[str]:
         """
@@ -92,53 +126,74 @@ class UserPreprocessor:
             try:
                 with open(cache_path, 'rb') as f:
                     cached_data = pickle.load(f)
-                    # Verify cache is valid
-                    if 'users' in cached_data and 'model_dim' in cached_data:
-                        print(f"Loaded {len(cached_data['users'])} preprocessed users from cache")
-                        self.model_dim = cached_data['model_dim']
-                        return cached_data['users']
+                # Verify cache is valid
+                if 'users' in cached_data and 'model_dim' in cached_data:
+                    users = cached_data['users']
+                    if cached_data.get('has_matrix'):
+                        # Embedding matrix lives in an .npy sidecar;
+                        # memory-mapping it makes the load near-instant and
+                        # pages rows in only as the matcher touches them
+                        matrix = np.load(self._matrix_path(cache_path), mmap_mode='r')
+                        self.embedding_matrix = matrix
+                        self.user_ids = np.array([u['id'] for u in users])
+                        for i, user in enumerate(users):
+                            user['embedding'] = matrix[i]
+                    elif users and users[0].get('embedding') is not None:
+                        # Legacy all-pickle cache: rebuild the SoA layout
+                        self._build_soa_views(users)
+                    print(f"Loaded {len(users)} preprocessed users from cache")
+                    self.model_dim = cached_data['model_dim']
+                    return users
             except Exception as e:
                 print(f"Failed to load cache: {e}, recomputing...")
         
-        # Load or create embedding model
+        # Load or create embedding model (ONNX Runtime backend when available)
         if self.embedding_model is None:
             print(f"Loading embedding model: {config.EMBEDDING_MODEL}")
-            self.embedding_model = SentenceTransformer(config.EMBEDDING_MODEL)
+            self.embedding_model = load_sentence_transformer(config.EMBEDDING_MODEL)
         
         # Ensure model_dim is set
         if self.model_dim is None:
-            # Get model dimension
-            test_embedding = self.embedding_model.encode(["test"])
-            self.model_dim = test_embedding.shape[1]
+            self.model_dim = self.embedding_model.get_sentence_embedding_dimension()
         
         preprocessed_users = []
         names_to_embed = []
         user_indices = []
-        
-        # Process each user
-        for idx, row in users_df.iterrows():
-            user_id = str(row.get('id', ''))
-            name_raw = str(row.get('name', '')).strip()
-            
-            # Skip empty names
-            if not user_id or not name_raw or name_raw.lower() in ['nan', 'none', '']:
-                continue
-            
-            # Normalize
-            name_lc = name_raw.lower().strip()
+
+        # Vectorized normalization: pandas string ops run in C across the
+        # whole column, and the boolean mask drops empty/nan rows in one
+        # shot instead of per-row checks inside an iterrows() loop (which
+        # pays a Series construction per user)
+        if 'id' in users_df.columns and 'name' in users_df.columns:
+            ids = users_df['id'].astype(str)
+            names_raw = users_df['name'].astype(str).str.strip()
+            names_lc = names_raw.str.lower()
+            mask = ids.ne('') & names_raw.ne('') & ~names_lc.isin(['nan', 'none'])
+            rows = zip(
+                ids[mask].to_numpy(),
+                names_raw[mask].to_numpy(),
+                names_lc[mask].to_numpy()
+            )
+        else:
+            rows = ()
+
+        # Process each surviving user
+        for user_id, name_raw, name_lc in rows:
             name_strip_accents = self.strip_accents(name_lc)
-            
+
             if not name_strip_accents:
                 continue
-            
+
             # Tokenize
-            tokens = [t.strip() for t in name_strip_accents.split() if t.strip()]
+            tokens = name_strip_accents.split()
             if not tokens:
                 continue
             
-            # Generate features
+            # Generate features (lowercase forms precomputed so the fuzzy
+            # hot loop never lowercases per pair)
             initials = self.generate_initials(tokens)
             reversed_name = self.generate_reversed_name(tokens)
+            tokens_lc = tuple(t.lower() for t in tokens)
             
             # Store user data
             user_record = {
@@ -147,9 +202,15 @@ class UserPreprocessor:
                 'name_lc': name_lc,
                 'name_strip_accents': name_strip_accents,
                 'tokens': tokens,
+                'tokens_lc': tokens_lc,
+                'first_lc': tokens_lc[0],
+                'last_lc': tokens_lc[-1],
                 'initials': initials,
+                'initials_lc': initials.lower(),
                 'reversed_name': reversed_name,
-                'embedding': None  # Will be filled after batch encoding
+                'embedding': None,  # Will be filled after batch encoding
+                'embedding_q': None,  # int8 quantized embedding
+                'embedding_scale': None  # per-row scale for embedding_q
             }
             
             preprocessed_users.append(user_record)
@@ -159,31 +220,66 @@ class UserPreprocessor:
         # Batch encode embeddings
         if names_to_embed:
             print(f"Computing embeddings for {len(names_to_embed)} users...")
-            embeddings = self.embedding_model.encode(
-                names_to_embed,
-                convert_to_numpy=True,
-                show_progress_bar=True
-            )
-            
-            # Assign embeddings
+            # encode() length-sorts internally (smart batching), so a fixed
+            # batch size pads each minibatch only to its own longest name;
+            # normalize_embeddings fuses the L2 normalization
+            with torch.inference_mode():
+                embeddings = self.embedding_model.encode(
+                    names_to_embed,
+                    batch_size=config.ENCODE_BATCH_SIZE,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=True
+                )
+
+            # One shared C-contiguous float32 matrix; each user's
+            # 'embedding' is a view into it (SoA layout), so the matcher
+            # streams one buffer instead of chasing per-dict arrays
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+            # One shape check on the whole matrix replaces the per-user
+            # dimension assertions
+            assert embeddings.shape == (len(user_indices), self.model_dim), \
+                f"Embedding matrix shape {embeddings.shape} != expected " \
+                f"({len(user_indices)}, {self.model_dim})"
+
+            # Assign embeddings (unit-norm views plus int8 quantized form
+            # for the bandwidth-bound cosine scan at query time)
             for i, user_idx in enumerate(user_indices):
                 preprocessed_users[user_idx]['embedding'] = embeddings[i]
-            
-            # Validate embeddings
-            for user in preprocessed_users:
-                if user['embedding'] is not None:
-                    assert user['embedding'].shape[0] == self.model_dim, \
-                        f"Embedding dimension mismatch: {user['embedding'].shape[0]} != {self.model_dim}"
+                quantized, scale = self.quantize_embedding(embeddings[i])
+                preprocessed_users[user_idx]['embedding_q'] = quantized
+                preprocessed_users[user_idx]['embedding_scale'] = scale
+
+            # Expose the SoA form directly: the rows are the same buffer
+            # the per-user views point into
+            self.embedding_matrix = embeddings
+            self.user_ids = np.array([u['id'] for u in preprocessed_users])
         
-        # Save to cache
+        # Save to cache: the float32 matrix goes to an .npy sidecar (loaded
+        # via memmap at startup) so pickle only carries the small metadata
         if cache_path:
             try:
                 os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                has_matrix = self.embedding_matrix is not None
+                if has_matrix:
+                    np.save(self._matrix_path(cache_path), self.embedding_matrix)
+                # Strip the matrix views from the pickled records; they are
+                # reattached as memmap rows on load
+                meta_users = []
+                for user in preprocessed_users:
+                    meta = dict(user)
+                    meta.pop('embedding', None)
+                    meta_users.append(meta)
+                # Protocol 5 plus pickletools.optimize keeps the metadata
+                # file small and fast to unpickle at startup
+                payload = pickle.dumps({
+                    'users': meta_users,
+                    'model_dim': self.model_dim,
+                    'has_matrix': has_matrix
+                }, protocol=5)
                 with open(cache_path, 'wb') as f:
-                    pickle.dump({
-                        'users': preprocessed_users,
-                        'model_dim': self.model_dim
-                    }, f)
+                    f.write(pickletools.optimize(payload))
                 print(f"Saved preprocessed users to {cache_path}")
             except Exception as e:
                 print(f"Failed to save cache: {e}")
@@ -191,6 +287,42 @@ class UserPreprocessor:
         print(f"Preprocessed {len(preprocessed_users)} users")
         return preprocessed_users
     
+    @staticmethod
+    def _matrix_path(cache_path: str) -> str:
+        """Path of the embedding-matrix sidecar next to the metadata cache."""
+        return cache_path + '.emb.npy'
+
+    def _build_soa_views(self, preprocessed_users: List[Dict[str, Any]]):
+        """
+        Rebuild the SoA embedding matrix from cached user records.
+
+        Pickled views come back as standalone arrays, so after a cache load
+        the embeddings are re-stacked into one contiguous matrix and each
+        record is re-pointed at its row, restoring the shared-buffer layout.
+
+        Args:
+            preprocessed_users: List of preprocessed user records
+        """
+        embeddings = [u.get('embedding') for u in preprocessed_users]
+        if not embeddings or any(e is None for e in embeddings):
+            self.embedding_matrix = None
+            self.user_ids = None
+            return
+
+        matrix = np.ascontiguousarray(np.stack(embeddings), dtype=np.float32)
+
+        # Baseline-era caches store raw encoder outputs (norms well above
+        # 1), and the matchers reuse this shared matrix assuming unit-norm
+        # rows - without this, "cosine" scores become raw dot products
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        self.embedding_matrix = matrix
+        self.user_ids = np.array([u['id'] for u in preprocessed_users])
+        for i, user in enumerate(preprocessed_users):
+            user['embedding'] = self.embedding_matrix[i]
+
     def get_user_dict(self, preprocessed_users: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         """
         Convert preprocessed users list to dictionary keyed by user ID.
@@ -213,8 +345,8 @@ class UserPreprocessor:
         Returns:
             List of unique tokens
         """
-        all_tokens = set()
-        for user in preprocessed_users:
-            all_tokens.update(user['tokens'])
-        return list(all_tokens)
+        # One C-level pass instead of a per-user update loop
+        return list(set(chain.from_iterable(
+            user['tokens'] for user in preprocessed_users
+        )))
 
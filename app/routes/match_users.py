@@ -1,6 +1,7 @@
 """Hybrid pipeline for matching users to transactions."""
 import time
 import pandas as pd
+from itertools import chain
 from typing import Dict, Any, List, Optional
 from sentence_transformers import SentenceTransformer
 
@@ -14,6 +15,47 @@ from app.matching.disambiguator import Disambiguator
 from app.observability.logger import RequestLogger
 
 
+# Pipeline components cached across requests, keyed by identity of the user
+# list and model. The components are stateless per request apart from their
+# own per-user-list caches, so rebuilding them (and re-flattening every
+# user's tokens) on each call was pure overhead - and rebuilding also threw
+# away the matchers' cached name/embedding matrices. Each entry stores the
+# keyed objects themselves: that keeps them alive (so their id()s cannot be
+# recycled) and lets the lookup verify identity instead of trusting raw ids.
+_pipeline_cache: Dict[tuple, tuple] = {}
+
+
+def _get_pipeline(
+    preprocessed_users: List[Dict[str, Any]],
+    embedding_model: SentenceTransformer
+) -> tuple:
+    """Build (or fetch) the matching components for a user list and model."""
+    key = (id(preprocessed_users), id(embedding_model))
+    entry = _pipeline_cache.get(key)
+    if entry is not None:
+        cached_users, cached_model, pipeline = entry
+        if cached_users is preprocessed_users and cached_model is embedding_model:
+            return pipeline
+
+    # Set-based dedup in one C-level pass: the normalizer only needs
+    # the unique tokens, and a set makes its membership checks O(1)
+    all_user_tokens = set(chain.from_iterable(
+        user.get('tokens', ()) for user in preprocessed_users
+    ))
+    pipeline = (
+        TextCleaner(),
+        CandidateExtractor(),
+        CandidateNormalizer(all_user_tokens=all_user_tokens),
+        FuzzyMatcher(config),
+        EmbeddingMatcher(config, embedding_model),
+        Disambiguator(config)
+    )
+    if len(_pipeline_cache) >= 4:
+        _pipeline_cache.clear()
+    _pipeline_cache[key] = (preprocessed_users, embedding_model, pipeline)
+    return pipeline
+
+
 def match_users(
     transaction_id: str,
     transactions: pd.DataFrame,
@@ -40,32 +82,38 @@ def match_users(
     """
     start_time = time.time()
     
-    # Find the transaction
-    transaction = transactions[transactions["id"] == transaction_id]
-    if transaction.empty:
-        return {"error": "Transaction not found"}
-    
+    # Find the transaction: O(1) index lookup when load_data has indexed
+    # the frame by id, boolean scan as a fallback for plain frames
+    if transactions.index.name == 'id':
+        try:
+            transaction = transactions.loc[transaction_id]
+        except KeyError:
+            return {"error": "Transaction not found"}
+        if isinstance(transaction, pd.DataFrame):
+            transaction = transaction.iloc[0]
+    else:
+        matched = transactions[transactions["id"] == transaction_id]
+        if matched.empty:
+            return {"error": "Transaction not found"}
+        transaction = matched.iloc[0]
+
     # Get the description
-    description = str(transaction.iloc[0]["description"])
+    description = str(transaction["description"])
     if not description:
         return {
             "users": [],
             "total_number_of_matches": 0
         }
     
-    # Initialize components
-    text_cleaner = TextCleaner()
-    candidate_extractor = CandidateExtractor()
-    
-    # Get all user tokens for normalizer
-    all_user_tokens = []
-    for user in preprocessed_users:
-        all_user_tokens.extend(user.get('tokens', []))
-    candidate_normalizer = CandidateNormalizer(all_user_tokens=all_user_tokens)
-    
-    fuzzy_matcher = FuzzyMatcher(config)
-    embedding_matcher = EmbeddingMatcher(config, embedding_model)
-    disambiguator = Disambiguator(config)
+    # Fetch the cached pipeline components for this user list/model
+    (
+        text_cleaner,
+        candidate_extractor,
+        candidate_normalizer,
+        fuzzy_matcher,
+        embedding_matcher,
+        disambiguator
+    ) = _get_pipeline(preprocessed_users, embedding_model)
     
     # Step 1: Soft clean description
     soft_cleaned = text_cleaner.soft_clean(
@@ -80,11 +128,9 @@ def match_users(
     )
     
     # Step 3: If no candidates, use hard clean + fallback windows
+    # (derived from the soft-cleaned text, not re-cleaned from scratch)
     if not candidates:
-        hard_cleaned = text_cleaner.hard_clean(
-            description,
-            max_length=config.MAX_DESCRIPTION_LENGTH
-        )
+        hard_cleaned = text_cleaner.hard_clean_from_soft(soft_cleaned)
         candidates = candidate_extractor.extract_candidates(
             hard_cleaned,
             max_candidates=config.MAX_CANDIDATES
@@ -114,7 +160,7 @@ def match_users(
     all_variants = []
     for candidate in candidates:
         normalized = candidate_normalizer.normalize_candidate(candidate.text)
-        variants = candidate_normalizer.generate_variants(
+        variants = candidate_normalizer.generate_variants_normalized(
             normalized,
             max_variants=config.MAX_VARIANTS_PER_CANDIDATE
         )
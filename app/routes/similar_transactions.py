@@ -1,9 +1,23 @@
-from sentence_transformers import SentenceTransformer, util
+from functools import lru_cache
+
+from sentence_transformers import SentenceTransformer
 import torch
 import pandas as pd
 
-# Load the model once when module is imported
-model = SentenceTransformer('all-MiniLM-L6-v2')
+from app.config.settings import config
+from app.utils import configure_torch_threads, load_sentence_transformer
+
+configure_torch_threads()
+
+# Load the model once when module is imported (ONNX backend when available)
+model = load_sentence_transformer('all-MiniLM-L6-v2')
+
+# Resolve the (Rust-backed) fast tokenizer once instead of re-walking the
+# model attributes per request
+try:
+    _tokenizer = model.tokenizer
+except AttributeError:
+    _tokenizer = model[0].tokenizer
 
 # Cache embeddings for transactions to avoid recomputing
 _transaction_embeddings = None
@@ -12,15 +26,46 @@ _transaction_descriptions = None
 def initialize_transaction_embeddings(transactions: pd.DataFrame):
     """
     Initialize and cache transaction embeddings for faster lookups.
-    
+
     Args:
         transactions: DataFrame containing transaction data
     """
     global _transaction_embeddings, _transaction_descriptions
-    
+
     descriptions = transactions["description"].tolist()
     _transaction_descriptions = descriptions
-    _transaction_embeddings = model.encode(descriptions, convert_to_tensor=True, show_progress_bar=True)
+    # Unit-normalized FP16 corpus: cosine becomes a plain matmul and the
+    # mat-vec streams half the bytes of FP32
+    # A fixed batch size lets encode()'s internal length-sorting pad each
+    # minibatch only to its own longest description; inference_mode skips
+    # autograd bookkeeping
+    with torch.inference_mode():
+        _transaction_embeddings = model.encode(
+            descriptions,
+            batch_size=config.ENCODE_BATCH_SIZE,
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            show_progress_bar=True
+        ).half()
+    _encode_query.cache_clear()
+
+@lru_cache(maxsize=4096)
+def _encode_query(text: str) -> torch.Tensor:
+    """
+    Encode a query string to a unit-normalized FP16 tensor (cached).
+
+    Args:
+        text: Query string
+
+    Returns:
+        Normalized FP16 embedding tensor
+    """
+    with torch.inference_mode():
+        return model.encode(
+            text,
+            convert_to_tensor=True,
+            normalize_embeddings=True
+        ).half()
 
 def similar_transactions(input_text: str, transactions: pd.DataFrame):
     """
@@ -39,44 +84,39 @@ def similar_transactions(input_text: str, transactions: pd.DataFrame):
     if _transaction_embeddings is None:
         initialize_transaction_embeddings(transactions)
     
-    # Encode the input text
-    input_embedding = model.encode(input_text, convert_to_tensor=True)
-    
-    # Calculate cosine similarity
-    cosine_scores = util.pytorch_cos_sim(input_embedding, _transaction_embeddings)[0]
-    
-    # Get top 5 most similar transactions
-    sorted_indices = torch.argsort(cosine_scores, descending=True)
+    # Encode the input text (LRU-cached, so repeat queries skip the model)
+    input_embedding = _encode_query(input_text)
+
+    # Both sides are unit-normalized, so cosine similarity is a plain
+    # mat-vec with no internal norm divisions
+    cosine_scores = torch.matmul(_transaction_embeddings, input_embedding)
     
-    results = []
-    for idx in sorted_indices[:5]:
-        transaction_idx = idx.item()
-        similarity_score = cosine_scores[idx].item()
-        
-        results.append({
-            "id": transactions.iloc[transaction_idx]["id"],
-            "description": transactions.iloc[transaction_idx]["description"],
+    # Get top 5 most similar transactions: topk is O(N) selection versus
+    # argsort's full O(N log N) sort and permutation tensor
+    top_scores, top_indices = torch.topk(
+        cosine_scores, k=min(5, cosine_scores.numel())
+    )
+    indices_list = top_indices.tolist()
+    scores_list = top_scores.tolist()
+
+    # One vectorized gather of the result rows instead of per-index .iloc
+    top_rows = transactions.iloc[indices_list]
+    results = [
+        {
+            "id": row_id,
+            "description": row_description,
             "similarity_score": round(similarity_score, 4)
-        })
+        }
+        for row_id, row_description, similarity_score in zip(
+            top_rows["id"], top_rows["description"], scores_list
+        )
+    ]
     
-    # Count tokens using the model's tokenizer (accurate token counting)
-    # Access tokenizer from the underlying transformer model
-    try:
-        # Try direct access (most common case)
-        tokenizer = model.tokenizer
-        tokens = tokenizer.tokenize(input_text)
-        total_tokens = len(tokens)
-    except AttributeError:
-        # Fallback: try accessing through the first module
-        try:
-            tokenizer = model[0].tokenizer
-            tokens = tokenizer.tokenize(input_text)
-            total_tokens = len(tokens)
-        except (AttributeError, IndexError):
-            # Final fallback: use encode and count tokens from the output
-            # Access through the first module's tokenizer
-            encoded = model[0].tokenizer.encode(input_text, add_special_tokens=True)
-            total_tokens = len(encoded)
+    # Count tokens with one fast-tokenizer call; includes the special
+    # tokens the model actually consumed
+    total_tokens = len(
+        _tokenizer(input_text, add_special_tokens=True)['input_ids']
+    )
     
     return {
         "transactions": results,
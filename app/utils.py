@@ -1,18 +1,108 @@
 import pandas as pd
 import os
 
+_torch_threads_configured = False
+
+def configure_torch_threads():
+    """
+    Set torch intra/inter-op thread counts once per process.
+
+    The SBERT docs recommend 4-8 intra-op threads for CPU encode; a single
+    inter-op thread avoids OpenMP contention between concurrent requests.
+    Safe to call from multiple modules - only the first call takes effect.
+    """
+    global _torch_threads_configured
+    if _torch_threads_configured:
+        return
+    _torch_threads_configured = True
+
+    import torch
+
+    torch.set_num_threads(min(8, os.cpu_count() or 1))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already set, or parallel work has started - keep the defaults
+        pass
+
+def load_sentence_transformer(model_name: str):
+    """
+    Load a SentenceTransformer, preferring the ONNX Runtime backend.
+
+    With optimum[onnxruntime] installed, sentence-transformers exports the
+    model to ONNX and runs it through ORT, which is typically 2-4x faster
+    than the PyTorch backend for CPU inference. Falls back to the default
+    backend when the extras are missing.
+
+    Args:
+        model_name: Model name or path
+
+    Returns:
+        Loaded SentenceTransformer instance
+    """
+    from sentence_transformers import SentenceTransformer
+
+    try:
+        import onnxruntime  # noqa: F401
+        import optimum.onnxruntime  # noqa: F401
+    except ImportError:
+        return SentenceTransformer(model_name)
+
+    try:
+        return SentenceTransformer(model_name, backend="onnx")
+    except Exception as e:
+        print(f"ONNX backend unavailable for {model_name} ({e}), using default")
+        return SentenceTransformer(model_name)
+
+def _read_table(csv_path: str) -> pd.DataFrame:
+    """
+    Read a data table, preferring a parquet sibling over the CSV.
+
+    Parquet loads several times faster than CSV (no tokenization or dtype
+    inference) and needs pyarrow; when the parquet file or engine is
+    missing the CSV is read instead and a parquet copy is written for the
+    next startup where possible.
+
+    Args:
+        csv_path: Path of the CSV file
+
+    Returns:
+        Loaded DataFrame
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    if os.path.exists(parquet_path):
+        try:
+            return pd.read_parquet(parquet_path)
+        except ImportError:
+            pass
+
+    df = pd.read_csv(csv_path)
+
+    # One-time migration: write the parquet copy if an engine is available
+    if not os.path.exists(parquet_path):
+        try:
+            df.to_parquet(parquet_path)
+        except (ImportError, OSError):
+            pass
+
+    return df
+
 def load_data():
     """
-    Load transactions and users data from CSV files.
-    
+    Load transactions and users data files.
+
     Returns:
         tuple: (transactions DataFrame, users DataFrame)
     """
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     transactions_path = os.path.join(base_dir, "data", "transactions.csv")
     users_path = os.path.join(base_dir, "data", "users.csv")
-    
-    transactions = pd.read_csv(transactions_path)
-    users = pd.read_csv(users_path)
-    
+
+    transactions = _read_table(transactions_path)
+    users = _read_table(users_path)
+
+    # Index transactions by id (kept as a column too) so per-request
+    # lookups are O(1) hash probes instead of full boolean scans
+    transactions = transactions.set_index('id', drop=False)
+
     return transactions, users
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""Optional build script that AOT-compiles the matching hot path with mypyc.
+
+The service runs fine as pure Python; running
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+compiles the candidate extractor and normalizer (pure string manipulation,
+invoked per transaction) to C extensions, which typically yields 2-4x on
+that code. The generated .so files shadow the .py modules at import time,
+so no call sites change.
+"""
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+    ext_modules = mypycify([
+        '--ignore-missing-imports',
+        '--follow-imports=silent',
+        'app/matching/candidate_extractor.py',
+        'app/matching/candidate_normalizer.py',
+    ])
+except ImportError:
+    ext_modules = []
+
+setup(
+    name='deel-matching',
+    version='1.0.0',
+    packages=['app'],
+    ext_modules=ext_modules,
+)
@@ -0,0 +1,439 @@
+"""Manual HTTP smoke tests against a running API server.
+
+Start the server first (``uvicorn app.main:app``), then run:
+
+    python test_api.py
+
+This is a driver for exercising the deployed endpoints end to end; it is
+not collected by pytest (see ``testpaths`` in pytest.ini). The cases are
+dispatched concurrently so total wall time is roughly the slowest single
+request rather than the sum of all of them.
+"""
+import asyncio
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+BASE_URL = os.environ.get("DEEL_API_URL", "http://localhost:8000")
+
+logger = logging.getLogger("test_api")
+
+# Prebuilt URL strings: the hot helpers do one concatenation (or none)
+# per call instead of re-running the f-string formatter on every request
+HEALTH_URL = BASE_URL + "/health"
+MATCH_PREFIX = BASE_URL + "/match_users/"
+SIMILAR_URL = BASE_URL + "/similar_transactions"
+SIMILAR_BATCH_URL = SIMILAR_URL + "/batch"
+
+# One shared session with keep-alive and a connection pool sized for the
+# thread pool below: connections are reused across calls instead of paying
+# a DNS lookup and TCP handshake per request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+
+# Response schemas, compiled once into fused validation routines when
+# fastjsonschema is installed; one call then replaces the whole per-item
+# assert chain. The asserts remain as the fallback path.
+MATCH_SCHEMA = {
+    "type": "object",
+    "required": ["users", "total_number_of_matches"],
+    "properties": {
+        "total_number_of_matches": {"type": "integer", "minimum": 0},
+        "users": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id", "name", "match_metric", "method"],
+                "properties": {
+                    "match_metric": {
+                        "type": "number", "minimum": 0, "maximum": 100
+                    },
+                    "method": {"enum": ["fuzzy", "embedding"]}
+                }
+            }
+        }
+    }
+}
+
+SIMILAR_SCHEMA = {
+    "type": "object",
+    "required": ["transactions", "total_number_of_tokens_used"],
+    "properties": {
+        "total_number_of_tokens_used": {"type": "integer", "minimum": 0},
+        "transactions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id", "description", "similarity_score"],
+                "properties": {
+                    "similarity_score": {"type": "number"}
+                }
+            }
+        }
+    }
+}
+
+if fastjsonschema is not None:
+    VALIDATE_MATCH = fastjsonschema.compile(MATCH_SCHEMA)
+    VALIDATE_SIMILAR = fastjsonschema.compile(SIMILAR_SCHEMA)
+else:
+    VALIDATE_MATCH = None
+    VALIDATE_SIMILAR = None
+
+
+def _loads(payload):
+    """Parse a JSON response body.
+
+    orjson parses straight from bytes in C, skipping the bytes->str decode
+    that response.json() does; stdlib json is the fallback.
+    """
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _validate_match(result):
+    """Validate a match_users response body."""
+    if VALIDATE_MATCH is not None:
+        VALIDATE_MATCH(result)
+        return
+    assert "users" in result
+    assert "total_number_of_matches" in result
+    for user in result["users"]:
+        assert "id" in user
+        assert "name" in user
+        assert "match_metric" in user
+        assert "method" in user
+        assert user["method"] in ["fuzzy", "embedding"]
+    # One C-level conversion both type-checks every metric (raises on
+    # non-numeric) and range-checks them, instead of a Python-level
+    # isinstance + comparison pair per user
+    metrics = np.asarray(
+        [user["match_metric"] for user in result["users"]], dtype=np.float32
+    )
+    assert ((metrics >= 0) & (metrics <= 100)).all()
+
+
+def _validate_similar(result):
+    """Validate a similar_transactions response body."""
+    if VALIDATE_SIMILAR is not None:
+        VALIDATE_SIMILAR(result)
+        return
+    assert "transactions" in result
+    assert "total_number_of_tokens_used" in result
+    for txn in result["transactions"]:
+        assert "id" in txn
+        assert "description" in txn
+        assert "similarity_score" in txn
+    # Single vectorized numeric check over all scores
+    scores = np.asarray(
+        [txn["similarity_score"] for txn in result["transactions"]],
+        dtype=np.float32
+    )
+    assert np.isfinite(scores).all()
+
+
+@dataclass(frozen=True)
+class TxnSummary:
+    """Compact view of a returned transaction for display.
+
+    Built in a single pass over the response with no copies of the
+    payload, so showing results costs two field reads per transaction
+    instead of serializing (or duplicating) the whole body.
+    """
+    id: str
+    similarity_score: float
+
+
+def _summarize(result):
+    """One-pass list of TxnSummary views over a similar_transactions body."""
+    return [
+        TxnSummary(txn["id"], txn["similarity_score"])
+        for txn in result["transactions"]
+    ]
+
+
+def test_health_check():
+    """Check the /health endpoint."""
+    response = SESSION.get(HEALTH_URL)
+    assert response.status_code == 200, response.text
+    result = _loads(response.content)
+    logger.debug("response: %s", result)
+    return result
+
+
+# match_users responses cached by transaction id, shared by the sync and
+# async paths. The same ids recur across tasks within a run; caching the
+# (status, body) pair skips the repeat round-trip and server-side
+# inference. --no-cache disables it for the whole run.
+_match_cache = {}
+_cache_enabled = True
+
+
+def _match_users_cached(transaction_id):
+    """Fetch /match_users/{transaction_id}, cached per process."""
+    if _cache_enabled:
+        cached = _match_cache.get(transaction_id)
+        if cached is not None:
+            return cached
+    response = SESSION.get(MATCH_PREFIX + transaction_id)
+    pair = response.status_code, response.text
+    if _cache_enabled:
+        _match_cache[transaction_id] = pair
+    return pair
+
+
+def test_match_users(transaction_id):
+    """Check /match_users/{transaction_id} and validate the response shape."""
+    status_code, body = _match_users_cached(transaction_id)
+    if status_code == 404:
+        logger.info("%s: transaction not found", transaction_id)
+        return None
+    assert status_code == 200, body
+    result = _loads(body)
+    logger.debug("response: %s", result)
+
+    _validate_match(result)
+    return result
+
+
+def test_similar_transactions(query, expected_transaction_ids=None):
+    """Check /similar_transactions and validate the response shape."""
+    response = SESSION.post(SIMILAR_URL, json={"query": query})
+    assert response.status_code == 200, response.text
+    result = _loads(response.content)
+    logger.debug("response: %s", result)
+
+    _validate_similar(result)
+    logger.info("results: %s", _summarize(result))
+
+    if expected_transaction_ids:
+        # Set membership: one pass to build, O(1) per expected id
+        found_ids = {txn["id"] for txn in result["transactions"]}
+        for expected_id in expected_transaction_ids:
+            if expected_id in found_ids:
+                logger.info("  found expected transaction %s", expected_id)
+    return result
+
+
+def test_similar_transactions_batch(cases):
+    """Run all similar_transactions cases in one /similar_transactions/batch
+    call, so the server encodes the queries as a single mini-batch instead
+    of re-entering the model once per request.
+
+    Falls back to per-query calls when the server does not expose the batch
+    endpoint yet (it is additive and may lag behind this driver).
+    """
+    queries = [query for query, _ in cases]
+    response = SESSION.post(SIMILAR_BATCH_URL, json={"queries": queries})
+    if response.status_code == 404:
+        logger.info("batch endpoint unavailable, falling back to per-query calls")
+        return [test_similar_transactions(*case) for case in cases]
+    assert response.status_code == 200, response.text
+    results = _loads(response.content)["results"]
+    assert len(results) == len(cases)
+    for result, (query, expected_ids) in zip(results, cases):
+        logger.debug("query: %s", query)
+        logger.debug("response: %s", result)
+        _validate_similar(result)
+        logger.info("query %r results: %s", query, _summarize(result))
+        if expected_ids:
+            found_ids = {txn["id"] for txn in result["transactions"]}
+            for expected_id in expected_ids:
+                if expected_id in found_ids:
+                    logger.info("  found expected transaction %s", expected_id)
+    return results
+
+
+async def _amatch_users(client, transaction_id):
+    """Async variant of test_match_users over a shared AsyncClient."""
+    cached = _match_cache.get(transaction_id) if _cache_enabled else None
+    if cached is not None:
+        status_code, body = cached
+    else:
+        response = await client.get(f"/match_users/{transaction_id}")
+        status_code, body = response.status_code, response.text
+        if _cache_enabled:
+            _match_cache[transaction_id] = (status_code, body)
+    if status_code == 404:
+        logger.info("%s: transaction not found", transaction_id)
+        return None
+    assert status_code == 200, body
+    result = _loads(body)
+    logger.debug("response: %s", result)
+    _validate_match(result)
+    return result
+
+
+async def _asimilar_transactions(client, query, expected_transaction_ids=None):
+    """Async variant of test_similar_transactions."""
+    response = await client.post(
+        "/similar_transactions", json={"query": query}
+    )
+    assert response.status_code == 200, response.text
+    result = _loads(response.content)
+    logger.debug("response: %s", result)
+    _validate_similar(result)
+    logger.info("results: %s", _summarize(result))
+    if expected_transaction_ids:
+        found_ids = {txn["id"] for txn in result["transactions"]}
+        for expected_id in expected_transaction_ids:
+            if expected_id in found_ids:
+                logger.info("  found expected transaction %s", expected_id)
+    return result
+
+
+async def _asimilar_batch(client, cases):
+    """Async variant of test_similar_transactions_batch."""
+    queries = [query for query, _ in cases]
+    response = await client.post(
+        "/similar_transactions/batch", json={"queries": queries}
+    )
+    if response.status_code == 404:
+        logger.info("batch endpoint unavailable, falling back to per-query calls")
+        return await asyncio.gather(
+            *(_asimilar_transactions(client, *case) for case in cases)
+        )
+    assert response.status_code == 200, response.text
+    results = _loads(response.content)["results"]
+    assert len(results) == len(cases)
+    for result, (query, expected_ids) in zip(results, cases):
+        logger.debug("query: %s", query)
+        logger.debug("response: %s", result)
+        _validate_similar(result)
+        logger.info("query %r results: %s", query, _summarize(result))
+        if expected_ids:
+            found_ids = {txn["id"] for txn in result["transactions"]}
+            for expected_id in expected_ids:
+                if expected_id in found_ids:
+                    logger.info("  found expected transaction %s", expected_id)
+    return results
+
+
+# Task 1: match_users cases (last one exercises the 404 path)
+MATCH_CASES = [
+    "RAZbbmLX",
+    "caqjJtrI",
+    "AcwQVVtq",
+    "YPOEKpLs",
+    "nonexistent",
+]
+
+# Task 2: similar_transactions cases
+SIMILAR_CASES = [
+    ("Transfer from Emma Brown for Deel", ["RAZbbmLX"]),
+    ("From Liam Johnson for Deel", ["caqjJtrI"]),
+    ("Payment from Olivia Smith", ["AcwQVVtq"]),
+    ("From William Martinez for Deel", ["YPOEKpLs"]),
+    ("salary payment with reference number", None),
+]
+
+
+async def _run_async():
+    """Drive every case concurrently through one httpx.AsyncClient.
+
+    All requests are in flight at once over a pooled connection (HTTP/2
+    multiplexing when the h2 package is installed), so total wall time is
+    roughly the slowest single request.
+    """
+    kwargs = {
+        "base_url": BASE_URL,
+        "limits": httpx.Limits(max_connections=16),
+        "timeout": 60.0,
+    }
+    try:
+        import h2  # noqa: F401
+        kwargs["http2"] = True
+    except ImportError:
+        pass
+
+    failures = 0
+    async with httpx.AsyncClient(**kwargs) as client:
+        names = [f"match_users({tid})" for tid in MATCH_CASES]
+        names.append("similar_transactions_batch")
+        coros = [_amatch_users(client, tid) for tid in MATCH_CASES]
+        coros.append(_asimilar_batch(client, SIMILAR_CASES))
+        outcomes = await asyncio.gather(*coros, return_exceptions=True)
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, Exception):
+            failures += 1
+            print(f"FAIL {name}: {outcome}")
+        else:
+            print(f"PASS {name}")
+    return failures, len(coros)
+
+
+def _run_threaded():
+    """Thread-pool fallback driver used when httpx is not installed."""
+    # Task 2 goes out as one batched call; the server amortizes the model
+    # overhead across the queries instead of paying it five times
+    tasks = [(test_match_users, (tid,)) for tid in MATCH_CASES]
+    tasks += [(test_similar_transactions_batch, (SIMILAR_CASES,))]
+
+    # cores-2 keeps a couple of cores free for the dev server running on
+    # the same machine
+    max_workers = max(2, (os.cpu_count() or 4) - 2)
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fn, *args): (fn.__name__, args)
+            for fn, args in tasks
+        }
+        for future in as_completed(futures):
+            name, args = futures[future]
+            try:
+                future.result()
+                print(f"PASS {name}{args}")
+            except Exception as e:
+                failures += 1
+                print(f"FAIL {name}{args}: {e}")
+    return failures, len(tasks)
+
+
+if __name__ == "__main__":
+    # Response bodies are only serialized when debug logging is enabled:
+    # %s formatting is lazy, so normal runs skip the json/indent string
+    # building and the stdout writes entirely
+    logging.basicConfig(
+        level=logging.DEBUG if "--verbose" in sys.argv else logging.INFO,
+        format="%(message)s"
+    )
+
+    if "--no-cache" in sys.argv:
+        _cache_enabled = False
+
+    # Health check first and on its own: if the server is still loading
+    # models there is no point hammering it with the real cases
+    test_health_check()
+
+    if httpx is not None:
+        failures, total = asyncio.run(_run_async())
+    else:
+        failures, total = _run_threaded()
+
+    print(f"\n{total - failures}/{total} cases passed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,9 @@
+"""Shared pytest configuration for the test suite."""
+import os
+
+# Pin per-process thread pools before torch/tokenizers get imported: with
+# pytest-xdist every worker would otherwise spawn a full OpenMP pool and
+# oversubscribe the cores, which makes the CPU-bound encode steps slower
+# in parallel than they were serially.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
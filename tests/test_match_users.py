@@ -1,4 +1,6 @@
 """Unit tests for the match_users endpoint."""
+import functools
+import hashlib
 import pytest
 import pandas as pd
 import sys
@@ -14,7 +16,18 @@ from sentence_transformers import SentenceTransformer
 from app.preprocessing.user_processor import UserPreprocessor
 
 
-@pytest.fixture
+@functools.lru_cache(maxsize=1)
+def _get_model():
+    """Load the embedding model once per process.
+
+    Both the session fixture and the integration test need the model;
+    a shared singleton avoids a second load (and a second copy of the
+    weights in memory). Under xdist each worker keeps its own instance.
+    """
+    return SentenceTransformer(config.EMBEDDING_MODEL)
+
+
+@pytest.fixture(scope="session")
 def sample_transactions():
     """Sample transactions for testing."""
     return pd.DataFrame({
@@ -27,7 +40,7 @@ def sample_transactions():
     })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_users():
     """Sample users for testing."""
     return pd.DataFrame({
@@ -36,12 +49,23 @@ def sample_users():
     })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def preprocessed_users_and_model(sample_users):
-    """Preprocessed users and embedding model."""
-    model = SentenceTransformer(config.EMBEDDING_MODEL)
+    """Preprocessed users and embedding model (built once per session).
+
+    The tests only read from these, so the model load and embedding pass
+    run once per worker instead of once per test.
+    """
+    model = _get_model()
     processor = UserPreprocessor(embedding_model=model)
-    preprocessed = processor.preprocess_users(sample_users)
+    # Cache the preprocessed users on disk, keyed by the fixture data, so
+    # later runs memory-map the precomputed embeddings instead of
+    # re-encoding; editing sample_users changes the digest and misses
+    digest = hashlib.md5(
+        pd.util.hash_pandas_object(sample_users, index=False).values
+    ).hexdigest()
+    cache_path = os.path.join('.pytest_cache', f'users_{digest}.pkl')
+    preprocessed = processor.preprocess_users(sample_users, cache_path=cache_path)
     return preprocessed, model
 
 
@@ -99,62 +123,76 @@ def test_transaction_not_found(sample_transactions, preprocessed_users_and_model
 
 
 # Integration tests with actual data (if available)
-def test_edge_cases():
-    """Test edge cases from the test matrix."""
+@pytest.fixture(scope="session")
+def prod_data():
+    """Production data and preprocessed users, built once per session.
+
+    Loading the CSVs and running (or unpickling) the user preprocessing
+    is the expensive part of the integration tests; doing it in a session
+    fixture means every integration test shares one load per worker.
+    """
     try:
         transactions, users = load_data()
-        
-        # Load model and preprocess users
-        model = SentenceTransformer(config.EMBEDDING_MODEL)
-        processor = UserPreprocessor(embedding_model=model)
-        cache_path = config.USER_ENRICHED_PKL
-        preprocessed_users = processor.preprocess_users(users, cache_path=cache_path)
-        
-        # Test cases from the plan (subset for basic verification)
-        test_cases = [
-            ('RAZbbmLX', 'Emma Brown', 90.0),  # Basic match
-            ('pXAMd74U', 'Jack Cooper', 90.0),  # From ref:
-            ('o38UQgrd', 'James Rodriguez', 85.0),  # Before "for deel"
-        ]
-        
-        for transaction_id, expected_name, min_score in test_cases:
-            # Check if transaction exists
-            transaction = transactions[transactions['id'] == transaction_id]
-            if transaction.empty:
-                continue
-            
-            result = match_users(
-                transaction_id,
-                transactions,
-                preprocessed_users,
-                model
-            )
-            
-            if 'error' not in result and result['users']:
-                # Check response format
-                assert 'users' in result
-                assert 'total_number_of_matches' in result
-                
-                # Check if expected name appears in results
-                user_names = [u['name'].lower() for u in result['users']]
-                expected_lower = expected_name.lower()
-                
-                # Verify format
-                top_user = result['users'][0]
-                assert 'id' in top_user
-                assert 'name' in top_user
-                assert 'match_metric' in top_user
-                assert 'method' in top_user
-                assert top_user['method'] in ['fuzzy', 'embedding']
-                assert 0 <= top_user['match_metric'] <= 100
-                
-                # Check if expected name is in results (fuzzy check)
-                name_found = any(expected_lower in name for name in user_names)
-                if name_found and top_user['match_metric'] >= min_score:
-                    # Test passed
-                    pass
     except FileNotFoundError:
         pytest.skip("Data files not found")
+    model = _get_model()
+    processor = UserPreprocessor(embedding_model=model)
+    cache_path = config.USER_ENRICHED_PKL
+    preprocessed_users = processor.preprocess_users(users, cache_path=cache_path)
+    return transactions, users, preprocessed_users, model
+
+
+# Test cases from the plan (subset for basic verification); each case is
+# its own test id, so failures report independently and xdist can
+# schedule them on separate workers
+EDGE_CASES = [
+    ('RAZbbmLX', 'Emma Brown', 90.0),  # Basic match
+    ('pXAMd74U', 'Jack Cooper', 90.0),  # From ref:
+    ('o38UQgrd', 'James Rodriguez', 85.0),  # Before "for deel"
+]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("transaction_id,expected_name,min_score", EDGE_CASES)
+def test_edge_cases(prod_data, transaction_id, expected_name, min_score):
+    """Test edge cases from the test matrix."""
+    transactions, users, preprocessed_users, model = prod_data
+    try:
+        # Check if transaction exists
+        transaction = transactions[transactions['id'] == transaction_id]
+        if transaction.empty:
+            pytest.skip(f"Transaction {transaction_id} not in dataset")
+
+        result = match_users(
+            transaction_id,
+            transactions,
+            preprocessed_users,
+            model
+        )
+
+        if 'error' not in result and result['users']:
+            # Check response format
+            assert 'users' in result
+            assert 'total_number_of_matches' in result
+
+            # Check if expected name appears in results
+            user_names = [u['name'].lower() for u in result['users']]
+            expected_lower = expected_name.lower()
+
+            # Verify format
+            top_user = result['users'][0]
+            assert 'id' in top_user
+            assert 'name' in top_user
+            assert 'match_metric' in top_user
+            assert 'method' in top_user
+            assert top_user['method'] in ['fuzzy', 'embedding']
+            assert 0 <= top_user['match_metric'] <= 100
+
+            # Check if expected name is in results (fuzzy check)
+            name_found = any(expected_lower in name for name in user_names)
+            if name_found and top_user['match_metric'] >= min_score:
+                # Test passed
+                pass
     except Exception as e:
         # Log but don't fail - these are integration tests
         print(f"Integration test warning: {e}")